@@ -11,30 +11,52 @@ Python: 3.7+
 
 import os
 import time
-import base64
+import io
+import re
+import mmap
+import sys
+import argparse
+import json
+import errno
 import shutil
-
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from fpdf import FPDF
-
-from dotenv import load_dotenv
-load_dotenv()
+import hashlib
+import binascii
+import queue
+import zlib
+import contextlib
+import struct
+import zipfile
+import warnings
+import itertools
+import hmac
+import secrets
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl  # Reflink support (Linux only)
+except ImportError:
+    fcntl = None
+
+try:
+    import resource  # Peak RSS reporting (not available on Windows)
+except ImportError:
+    resource = None
+
+# Browser (selenium, webdriver_manager), PDF (fpdf) and .env (dotenv) modules
+# are imported inside the functions that use them, so offline subcommands
+# start without loading them.
 
 
 # ============================================================================
 # GLOBAL CONFIGURATION
 # ============================================================================
 
-# Authentication
-DEFAULT_EMAIL = os.getenv('EMAIL')
-DEFAULT_PASSWORD = os.getenv('PASSWORD')
+# Authentication (read from the environment or .env when capturing)
+EMAIL_ENV_VAR = 'EMAIL'
+PASSWORD_ENV_VAR = 'PASSWORD'
+DAEMON_TOKEN_ENV_VAR = 'DAEMON_TOKEN'  # Bearer token for the daemon's job API
 
 # Website URLs
 BASE_URL = "https://www.iplusinteractif.com/"
@@ -70,12 +92,85 @@ TIMEOUTS = {
     'post_click': 4
 }
 
+# Retry configuration for pages that failed during the main pass
+RETRY = {
+    'max_attempts': 3,
+    'backoff_base': 2
+}
+
 # File system
 TEMP_DIR = "imgs"
 SAVE_DIR = "save"
 DEFAULT_BOOK_NAME = "book"
 IMAGE_FORMAT = "png"
+MANIFEST_NAME = "manifest.jsonl"
+ARCHIVE_FORMAT = "cbz"
+STREAM_ARCHIVE_NAME = f"pages.{ARCHIVE_FORMAT}"  # Archive streamed inside TEMP_DIR during capture
+
+# Page labels, as shown in the viewer's page input (C1, C2, 1...N, annexes, C3, C4)
+FRONT_COVERS = ('C1', 'C2')
+BACK_COVERS = ('C3', 'C4')
+PAGE_LABEL_PATTERN = re.compile(r'^([A-Z]*)(\d*)')
+# Front matter is numbered i-xlix; bare C, D, L and M are annex letters, not numerals
+ROMAN_NUMERAL_PATTERN = re.compile(r'^(XL|X{0,3})(IX|IV|V?I{0,3})$')
+SPREAD_SIDE_PATTERN = re.compile(r'-[LR]$')  # Suffix of a spread half without its own label
+UNLABELED_VIEW_PATTERN = re.compile(r'^(.*)\+(\d+)$')  # "<previous page>+<n>": n-th unreadable view after it
+PAGE_FILE_PATTERN = re.compile(rf'^(\d[A-Z]*\d{{5}}(?:\.\d{{3}})?)_.+\.{IMAGE_FORMAT}$')
 PDF_DIMENSIONS = (2640, 3263)
+PDF_DPI = 300  # Fast-view PDFs size each page from its pixels at this resolution
+THUMBNAIL_SIZE = 128  # Longest side, in pixels, of the thumbnails embedded in fast-view PDFs
+
+# Fast-view PDF outline: one entry per label section, keyed by the first character of the sort key
+OUTLINE_SECTIONS = {
+    '0': "Cover",
+    '1': "Front matter",
+    '2': "Pages",
+    '3': "Annexes",
+    '4': "Back cover"
+}
+
+# Base64 characters decoded per slice when saving a page (must be a multiple of 4)
+DECODE_CHUNK_SIZE = 1 << 20
+
+# Page verification (PNG structure and manifest hashes)
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+VERIFY_WORKERS = 8
+
+# Profiling (--profile): stack sampling period for flame graphs and report length
+PROFILE = {
+    'dir': 'profiles',
+    'sample_interval': 0.005,
+    'top_allocations': 25
+}
+
+# Library catalog cache (books, volumes, page counts and labels)
+CATALOG_PATH = os.path.join(SAVE_DIR, "catalog.json")
+CATALOG_TTL = 7 * 24 * 3600  # Seconds before the book list is discovered again
+
+# Daemon mode: warm browser pool serving capture and build jobs over local HTTP
+DAEMON = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'pool_size': 2,
+    'max_attempts': 3,  # Capture attempts per job across driver crashes
+    'jobs_dir': 'jobs'
+}
+JOB_OUTPUTS = ('pdf', ARCHIVE_FORMAT, 'images')
+
+# capture --output choices, mapped to the options of the output prompt
+OUTPUT_CHOICES = {'pdf': "1", 'images': "2", 'backup': "3", ARCHIVE_FORMAT: "4", 'fast-pdf': "5"}
+
+# Large-book mode: pages are spilled to memory-mapped files as they arrive and
+# read back through mmap views; peak RSS is checked against the budget
+LARGE_BOOK = {
+    'enabled': False,
+    'memory_budget_mb': 512
+}
+
+# Backup engine: copies are only used when hard links and reflinks are unavailable
+BACKUP_COPY_WORKERS = 8
+BACKUP_CHUNK_SIZE = 8 << 20
+FICLONE = 0x40049409  # ioctl request number from linux/fs.h
 
 
 # ============================================================================
@@ -84,6 +179,8 @@ PDF_DIMENSIONS = (2640, 3263)
 
 def configure_chrome_options(headless=False, detach=True):
     """Configure Chrome options with defaults."""
+    from selenium.webdriver.chrome.options import Options
+    
     options = Options()
     
     if headless:
@@ -106,6 +203,10 @@ def configure_chrome_options(headless=False, detach=True):
 
 def create_driver(headless=False, detach=True):
     """Create and configure the Chrome driver."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+    
     options = configure_chrome_options(headless, detach)
     service = Service(ChromeDriverManager().install())
     
@@ -120,11 +221,19 @@ def create_driver(headless=False, detach=True):
 # AUTHENTICATION & NAVIGATION
 # ============================================================================
 
-def authenticate(driver, email=DEFAULT_EMAIL, password=DEFAULT_PASSWORD):
+def authenticate(driver, email=None, password=None, base_url=BASE_URL):
     """Perform user authentication."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    
+    email = email or os.getenv(EMAIL_ENV_VAR)
+    password = password or os.getenv(PASSWORD_ENV_VAR)
+    
     try:
         print("Starting authentication...")
-        driver.get(BASE_URL)
+        driver.get(base_url)
         
         wait = WebDriverWait(driver, TIMEOUTS['page_load'])
         
@@ -162,6 +271,9 @@ def authenticate(driver, email=DEFAULT_EMAIL, password=DEFAULT_PASSWORD):
 
 def handle_cookies_popup(driver):
     """Handle cookies popup with graceful fallback."""
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+    
     try:
         cookies_button = driver.find_element(By.ID, SELECTORS['cookies_reject'])
         if cookies_button.is_displayed():
@@ -173,6 +285,9 @@ def handle_cookies_popup(driver):
 
 def discover_books(driver):
     """Discover and catalog available books."""
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+    
     time.sleep(TIMEOUTS['navigation'])  # Allow page to stabilize
     
     try:
@@ -202,8 +317,33 @@ def discover_books(driver):
         return []
 
 
+def locate_book_element(driver, book):
+    """Find a catalogued book on the library page without walking every title."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    def book_containers_loaded(driver):
+        elements = driver.find_elements(By.XPATH, SELECTORS['book_containers'])
+        return elements if len(elements) > book['index'] else False
+    
+    try:
+        elements = WebDriverWait(driver, TIMEOUTS['page_load']).until(book_containers_loaded)
+        element = elements[book['index']]
+        
+        # Sanity check that the library has not been reordered
+        title = element.find_element(By.XPATH, SELECTORS['book_title']).text.strip()
+        return element if title == book['title'] else None
+        
+    except Exception as e:
+        print(f"Could not locate '{book['title']}' from the catalog: {e}")
+        return None
+
+
 def handle_commercial_popup(driver):
     """Handle commercial popup with graceful fallback."""
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+    
     try:
         close_popup = driver.find_element(By.XPATH, SELECTORS['popup_close'])
         close_popup.click()
@@ -212,13 +352,30 @@ def handle_commercial_popup(driver):
         pass  # No commercial popup
 
 
-def handle_volume_selection(driver):
+def handle_volume_selection(driver, requested_volume=None, interactive=True):
     """Handle volume selection for multi-volume books."""
+    from selenium.webdriver.common.by import By
+    
     try:
         nav_volumes = driver.find_elements(By.XPATH, SELECTORS['nav_volumes'])
         
         if not nav_volumes:
             return "None"  # Single volume book
+        
+        if requested_volume:
+            for volume in nav_volumes:
+                vol_title = volume.find_element(By.XPATH, SELECTORS['volume_title']).text
+                if vol_title.strip().lower() == requested_volume.strip().lower():
+                    volume.click()
+                    print(f"Selected volume: {vol_title}")
+                    return vol_title
+            
+            print(f"Volume '{requested_volume}' not found.")
+            return False
+        
+        if not interactive:
+            print("Multiple volumes detected but no volume was requested.")
+            return False
             
         print(f"\nMultiple volumes detected. Please select:")
         
@@ -247,7 +404,7 @@ def handle_volume_selection(driver):
         return None
 
 
-def select_book_and_volume(driver, book):
+def select_book_and_volume(driver, book, requested_volume=None, interactive=True):
     """Select a book and handle volume selection if necessary."""
     try:
         book['element'].click()
@@ -260,7 +417,7 @@ def select_book_and_volume(driver, book):
         handle_commercial_popup(driver)
         
         # Check for multiple volumes
-        selected_volume = handle_volume_selection(driver)
+        selected_volume = handle_volume_selection(driver, requested_volume, interactive)
         if selected_volume is False:  # User cancelled volume selection
             return None
             
@@ -273,6 +430,10 @@ def select_book_and_volume(driver, book):
 
 def open_book_viewer(driver):
     """Open the book viewer and navigate to first page."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    
     try:
         time.sleep(TIMEOUTS['post_click'])
         
@@ -286,24 +447,59 @@ def open_book_viewer(driver):
         time.sleep(TIMEOUTS['navigation'])
         
         # Navigate to cover page (C1)
+        if not go_to_page(driver, 'C1'):
+            return False
+        
+        print("Book viewer opened successfully")
+        return True
+        
+    except Exception as e:
+        print(f"Failed to open book viewer: {e}")
+        return False
+
+
+def go_to_page(driver, label):
+    """Jump to the page with the given label using the viewer's page input."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    
+    try:
+        wait = WebDriverWait(driver, TIMEOUTS['page_load'])
+        
         page_input = wait.until(
             EC.element_to_be_clickable((By.XPATH, SELECTORS['page_input']))
         )
         page_input.clear()
-        page_input.send_keys('C1')
+        page_input.send_keys(label)
         page_input.send_keys(u'\ue007')  # Enter key
         
         time.sleep(TIMEOUTS['navigation'])
-        
-        print("Book viewer opened successfully")
         return True
         
     except Exception as e:
-        print(f"Failed to open book viewer: {e}")
+        print(f"Failed to go to page {label}: {e}")
         return False
+
+
+def get_current_page_label(driver):
+    """Read the label of the current page from the viewer's page input."""
+    from selenium.webdriver.common.by import By
+    
+    try:
+        page_input = driver.find_element(By.XPATH, SELECTORS['page_input'])
+        label = (page_input.get_attribute('value') or '').strip()
+        return label or None
+    except Exception as e:
+        print(f"Could not read current page label: {e}")
+        return None
     
 
 def set_view_mode(driver, is_double_page):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    
     try:
         wait = WebDriverWait(driver, TIMEOUTS['page_load'])
 
@@ -349,15 +545,88 @@ def set_view_mode(driver, is_double_page):
 # IMAGE PROCESSING
 # ============================================================================
 
-def ensure_output_directory():
+def roman_to_int(numeral):
+    """Convert an uppercase roman numeral to an integer."""
+    values = {'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100, 'D': 500, 'M': 1000}
+    total = 0
+    
+    for current, following in zip(numeral, numeral[1:] + ' '):
+        value = values[current]
+        total += -value if values.get(following, 0) > value else value
+    
+    return total
+
+
+def page_sort_key(label):
+    """Compute a sortable key placing a page label in reading order.
+
+    Front covers come first, then roman-numbered front matter, numbered
+    pages, lettered annexes and finally back covers. The key is plain text
+    so that sorting file names sorts pages; both halves of an unsplit spread
+    (C1-L, C1-R) share the key of the view. A view whose label could not be
+    read ("12+1") sorts right after the page before it.
+    """
+    upper = SPREAD_SIDE_PATTERN.sub('', label.strip().upper())
+    
+    unlabeled = UNLABELED_VIEW_PATTERN.match(upper)
+    if unlabeled:
+        previous, sequence = unlabeled.groups()
+        previous_key = page_sort_key(previous) if previous else "000000"
+        return f"{previous_key}.{int(sequence):03d}"
+    
+    prefix, digits = PAGE_LABEL_PATTERN.match(upper).groups()
+    number = int(digits) if digits else 0
+    
+    if upper in FRONT_COVERS:
+        group, prefix = 0, ''
+    elif upper in BACK_COVERS:
+        group, prefix = 4, ''
+    elif digits and not prefix:
+        group = 2
+    elif prefix and not digits and ROMAN_NUMERAL_PATTERN.match(prefix):
+        group, number, prefix = 1, roman_to_int(prefix), ''
+    else:
+        group = 3
+    
+    return f"{group}{prefix}{number:05d}"
+
+
+def spread_page_labels(label):
+    """Split the label of a double-page spread into left and right labels."""
+    parts = [part.strip() for part in label.split('-')]
+    
+    if len(parts) == 2 and all(parts):
+        return parts[0], parts[1]
+    
+    return f"{label}-L", f"{label}-R"
+
+
+def page_filename(label):
+    """Build the file name of a page from its label."""
+    return f"{page_sort_key(label)}_{sanitize_filename(label)}.{IMAGE_FORMAT}"
+
+
+def page_file_path(label, directory=TEMP_DIR):
+    """Build the path of a page file from its label."""
+    return os.path.join(directory, page_filename(label))
+
+
+def page_exists(label, directory=TEMP_DIR):
+    """Check whether a page has already been captured."""
+    return os.path.exists(page_file_path(label, directory))
+
+
+def ensure_output_directory(directory=TEMP_DIR):
     """Ensure output directory exists."""
-    if not os.path.exists(TEMP_DIR):
-        os.makedirs(TEMP_DIR)
-        print(f"Created output directory: {TEMP_DIR}")
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+        print(f"Created output directory: {directory}")
 
 
 def extract_image_as_base64(driver):
     """Extract image as base64 using canvas technique."""
+    # The data URL prefix is stripped in the browser so the multi-megabyte
+    # payload is not copied again on the Python side
     js_script = """
     try {
         var imgElement = document.querySelector('img');
@@ -370,36 +639,231 @@ def extract_image_as_base64(driver):
         var ctx = canvas.getContext('2d');
         ctx.drawImage(imgElement, 0, 0, canvas.width, canvas.height);
         
-        return canvas.toDataURL('image/png');
+        var dataUrl = canvas.toDataURL('image/png');
+        return dataUrl.substring(dataUrl.indexOf(',') + 1);
     } catch(e) {
         return null;
     }
     """
     
     try:
-        base64_img = driver.execute_script(js_script)
-        return base64_img.split(',')[1] if base64_img else None
+        return driver.execute_script(js_script) or None
     except Exception as e:
         print(f"JavaScript extraction failed: {e}")
         return None
 
 
-def save_base64_image(base64_data, page_number):
+_decode_buffers = threading.local()
+
+
+def get_decode_buffer():
+    """Return this thread's reusable decode buffer."""
+    if not hasattr(_decode_buffers, 'buffer'):
+        _decode_buffers.buffer = bytearray()
+    return _decode_buffers.buffer
+
+
+def decoded_base64_size(base64_data):
+    """Compute the decoded size of unwrapped base64 data."""
+    padding = base64_data.count('=', max(len(base64_data) - 2, 0))
+    return len(base64_data) // 4 * 3 - padding
+
+
+def decode_base64_into(base64_data, buffer):
+    """Decode base64 data slice by slice into a buffer, growing it if needed.
+
+    Returns the number of decoded bytes at the start of the buffer.
+    """
+    size = decoded_base64_size(base64_data)
+    if len(buffer) < size:
+        buffer.extend(bytes(size - len(buffer)))
+    
+    offset = 0
+    with memoryview(buffer) as view:
+        for start in range(0, len(base64_data), DECODE_CHUNK_SIZE):
+            chunk = binascii.a2b_base64(base64_data[start:start + DECODE_CHUNK_SIZE])
+            view[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+    
+    return offset
+
+
+def temp_file_path(file_path):
+    """Build a hidden temp path next to a file, unique to this process and thread."""
+    directory, filename = os.path.split(file_path)
+    return os.path.join(directory, f".{filename}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def write_file_atomic(file_path, data):
+    """Write bytes to a temp file next to the target, then rename it over."""
+    temp_path = temp_file_path(file_path)
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    
+    try:
+        with memoryview(data) as view:
+            written = 0
+            while written < len(view):
+                written += os.write(fd, view[written:])
+        os.close(fd)
+        fd = None
+        os.replace(temp_path, file_path)
+        
+    except Exception:
+        if fd is not None:
+            os.close(fd)
+        os.unlink(temp_path)
+        raise
+
+
+def decode_base64_to_file(base64_data, file_path):
+    """Decode base64 data slice by slice straight into a memory-mapped temp file.
+
+    Nothing but the current slice is held in memory; the temp file is then
+    renamed into place.
+    """
+    size = decoded_base64_size(base64_data)
+    if size <= 0:
+        raise ValueError("empty image data")
+    
+    temp_path = temp_file_path(file_path)
+    
+    try:
+        with open(temp_path, 'w+b') as f:
+            f.truncate(size)
+            
+            with mmap.mmap(f.fileno(), size) as mapped:
+                offset = 0
+                for start in range(0, len(base64_data), DECODE_CHUNK_SIZE):
+                    chunk = binascii.a2b_base64(base64_data[start:start + DECODE_CHUNK_SIZE])
+                    mapped[offset:offset + len(chunk)] = chunk
+                    offset += len(chunk)
+                mapped.flush()
+            
+            if offset != size:
+                f.truncate(offset)
+        
+        os.replace(temp_path, file_path)
+        
+    except Exception:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+@contextlib.contextmanager
+def map_file(file_path):
+    """Map a file read-only and yield a memoryview of its contents."""
+    with open(file_path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            yield memoryview(b'')  # Empty files cannot be mapped
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def record_manifest_entry(label, file_path, image_data):
+    """Append the size and hash of a saved page to its directory's manifest."""
+    directory, filename = os.path.split(file_path)
+    entry = {
+        'label': label,
+        'file': filename,
+        'size': len(image_data),
+        'sha256': hashlib.sha256(image_data).hexdigest()
+    }
+    
+    with open(os.path.join(directory, MANIFEST_NAME), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def read_manifest(directory):
+    """Read a page manifest as {file name: entry}; later entries win."""
+    manifest = {}
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    
+    if not os.path.exists(manifest_path):
+        return manifest
+    
+    with open(manifest_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                manifest[entry['file']] = entry
+            except (ValueError, KeyError):
+                continue  # Line cut short by an interrupted run
+    
+    return manifest
+
+
+_page_archives = {}  # Directory -> archive receiving its pages while they are captured
+
+
+def open_page_archive(directory=TEMP_DIR):
+    """Start streaming pages saved in a directory into a stored CBZ archive.
+
+    PNG data is already compressed, so entries are stored as-is. Appending
+    keeps the pages of a resumed run.
+    """
+    archive_path = os.path.join(directory, STREAM_ARCHIVE_NAME)
+    _page_archives[directory] = zipfile.ZipFile(archive_path, 'a', zipfile.ZIP_STORED)
+    print(f"Streaming pages into {archive_path}")
+
+
+def close_page_archive(directory=TEMP_DIR):
+    """Stop streaming pages and write the archive's central directory."""
+    archive = _page_archives.pop(directory, None)
+    if archive is not None:
+        archive.close()
+
+
+def append_page_to_archive(file_path, image_data):
+    """Append a saved page to the archive streaming its directory, if any."""
+    directory, filename = os.path.split(file_path)
+    archive = _page_archives.get(directory)
+    
+    if archive is not None:
+        zip_info = zipfile.ZipInfo(filename, date_time=time.localtime()[:6])
+        
+        # A recaptured page is appended again; readers use the last copy
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            archive.writestr(zip_info, image_data)
+
+
+def save_base64_image(base64_data, page_label, directory=TEMP_DIR):
     """Save base64 image data to file."""
     try:
-        image_data = base64.b64decode(base64_data)
-        file_path = os.path.join(TEMP_DIR, f"{page_number}.{IMAGE_FORMAT}")
+        file_path = page_file_path(page_label, directory)
         
-        with open(file_path, 'wb') as f:
-            f.write(image_data)
+        if LARGE_BOOK['enabled']:
+            decode_base64_to_file(base64_data, file_path)
+            
+            with map_file(file_path) as image_data:
+                record_manifest_entry(page_label, file_path, image_data)
+                append_page_to_archive(file_path, image_data)
+            return
+        
+        buffer = get_decode_buffer()
+        size = decode_base64_into(base64_data, buffer)
+        
+        with memoryview(buffer) as view, view[:size] as image_data:
+            write_file_atomic(file_path, image_data)
+            record_manifest_entry(page_label, file_path, image_data)
+            append_page_to_archive(file_path, image_data)
             
     except Exception as e:
-        print(f"Failed to save image {page_number}: {e}")
+        print(f"Failed to save image {page_label}: {e}")
         raise
 
 
-def process_current_page(driver, page_number):
+def process_current_page(driver, page_label, directory=TEMP_DIR):
     """Process the current page image."""
+    from selenium.webdriver.common.by import By
+    
     try:
         # Locate main image
         image_element = driver.find_element(By.XPATH, SELECTORS['main_image'])
@@ -426,22 +890,24 @@ def process_current_page(driver, page_number):
             return False
         
         # Save image
-        save_base64_image(base64_data, page_number)
+        save_base64_image(base64_data, page_label, directory)
         
         # Cleanup - close current tab and return to book viewer
         driver.close()
         driver.switch_to.window(driver.window_handles[1])
         
-        print(f'Page #{page_number} saved successfully')
+        print(f'Page {page_label} saved successfully')
         return True
         
     except Exception as e:
-        print(f"Error processing page {page_number}: {e}")
+        print(f"Error processing page {page_label}: {e}")
         return False
     
 
-def process_left_page(driver, page_number):
+def process_left_page(driver, page_label, directory=TEMP_DIR):
     """Process the current left page image."""
+    from selenium.webdriver.common.by import By
+    
     try:
         # Locate main image
         image_element = driver.find_elements(By.XPATH, SELECTORS['main_image_double_page'])[0]
@@ -454,7 +920,7 @@ def process_left_page(driver, page_number):
         
         if int(img_width) < 10:
             print("No left page")
-            return False
+            return None  # Empty half of the spread, not an error
         
         # Open image in new tab
         driver.execute_script(f'window.open("{img_src}","_blank");')
@@ -473,22 +939,24 @@ def process_left_page(driver, page_number):
             return False
         
         # Save image
-        save_base64_image(base64_data, page_number)
+        save_base64_image(base64_data, page_label, directory)
         
         # Cleanup - close current tab and return to book viewer
         driver.close()
         driver.switch_to.window(driver.window_handles[1])
         
-        print(f'Page #{page_number} saved successfully')
+        print(f'Page {page_label} saved successfully')
         return True
         
     except Exception as e:
-        print(f"Error processing page {page_number}: {e}")
+        print(f"Error processing page {page_label}: {e}")
         return False
     
 
-def process_right_page(driver, page_number):
+def process_right_page(driver, page_label, directory=TEMP_DIR):
     """Process the current right page image."""
+    from selenium.webdriver.common.by import By
+    
     try:
         # Locate main image
         image_element = driver.find_elements(By.XPATH, SELECTORS['main_image_double_page'])[1]
@@ -501,7 +969,7 @@ def process_right_page(driver, page_number):
         
         if int(img_width) < 10:
             print("No right page")
-            return False
+            return None  # Empty half of the spread, not an error
         
         # Open image in new tab
         driver.execute_script(f'window.open("{img_src}","_blank");')
@@ -520,22 +988,25 @@ def process_right_page(driver, page_number):
             return False
         
         # Save image
-        save_base64_image(base64_data, page_number)
+        save_base64_image(base64_data, page_label, directory)
         
         # Cleanup - close current tab and return to book viewer
         driver.close()
         driver.switch_to.window(driver.window_handles[1])
         
-        print(f'Page #{page_number} saved successfully')
+        print(f'Page {page_label} saved successfully')
         return True
         
     except Exception as e:
-        print(f"Error processing page {page_number}: {e}")
+        print(f"Error processing page {page_label}: {e}")
         return False
 
 
 def navigate_to_next_page(driver):
     """Navigate to the next page if available."""
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+    
     try:
         next_element = driver.find_element(By.XPATH, SELECTORS['next_arrow'])
         
@@ -575,38 +1046,142 @@ def navigate_to_next_page(driver):
         return False
 
 
-def process_book_pages(driver, double_page_mode):
-    """Process all pages in the current book."""
-    ensure_output_directory()
+def capture_page(driver, side, page_label, directory=TEMP_DIR):
+    """Capture one side ('single', 'left' or 'right') of the current view."""
+    if side == 'left':
+        return process_left_page(driver, page_label, directory)
+    if side == 'right':
+        return process_right_page(driver, page_label, directory)
+    return process_current_page(driver, page_label, directory)
+
+
+def return_to_viewer(driver):
+    """Close leftover image tabs and switch back to the book viewer."""
+    try:
+        while len(driver.window_handles) > 2:
+            driver.switch_to.window(driver.window_handles[-1])
+            driver.close()
+        driver.switch_to.window(driver.window_handles[1])
+    except Exception as e:
+        print(f"Could not return to book viewer: {e}")
+
+
+def retry_failed_pages(driver, failed_pages, directory=TEMP_DIR):
+    """Retry failed pages with exponential backoff, jumping back by page label.
+
+    Pages of a view whose label could not be read cannot be navigated back
+    to, so they are reported as failed straight away.
+    """
+    recovered = 0
+    unreachable_pages = [page for page in failed_pages if not page['label']]
+    failed_pages = [page for page in failed_pages if page['label']]
+    
+    if unreachable_pages:
+        labels = ", ".join(page['page_label'] for page in unreachable_pages)
+        print(f"Pages without a viewer label cannot be retried: {labels}")
+    
+    for attempt in range(1, RETRY['max_attempts'] + 1):
+        if not failed_pages:
+            break
+        
+        delay = RETRY['backoff_base'] ** attempt
+        print(f"\nRetrying {len(failed_pages)} failed page(s) in {delay}s "
+              f"(attempt {attempt}/{RETRY['max_attempts']})")
+        time.sleep(delay)
+        
+        still_failed = []
+        
+        for page in failed_pages:
+            # Jump to the page itself, not to the "2-3" label of its spread
+            target_label = SPREAD_SIDE_PATTERN.sub('', page['page_label'])
+            
+            if (go_to_page(driver, target_label)
+                    and capture_page(driver, page['side'], page['page_label'], directory)):
+                recovered += 1
+            else:
+                return_to_viewer(driver)
+                still_failed.append(page)
+        
+        failed_pages = still_failed
+    
+    if failed_pages:
+        labels = ", ".join(page['page_label'] for page in failed_pages)
+        print(f"Pages still failing after {RETRY['max_attempts']} attempts: {labels}")
+    
+    return recovered, failed_pages + unreachable_pages
+
+
+def process_book_pages(driver, double_page_mode, skip_existing=False, expected_pages=None,
+                       directory=TEMP_DIR):
+    """Process all pages in the current book.
+
+    When the page count is known from the catalog, progress is reported with
+    an ETA and a short capture is flagged.
+    """
+    ensure_output_directory(directory)
+    
+    sides = ('left', 'right') if double_page_mode else ('single',)
     
     pages_processed = 0
+    previous_page_label = ''  # Last labeled page, anchoring views whose label cannot be read
+    unlabeled_views = 0
+    failed_pages = []
+    seen_pages = {}  # Page label -> where to find it again, for verification
     errors_encountered = 0
     start_time = time.time()
     
     try:
         while True:
-            # Process current page
-            if not double_page_mode:
-                success = process_current_page(driver, pages_processed)
-                
-                if success:
-                    pages_processed += 1
-                else:
-                    errors_encountered += 1
+            label = get_current_page_label(driver)
+            if label:
+                view_label = label
+                unlabeled_views = 0
             else:
-                success = process_left_page(driver, pages_processed)
-
-                if success:
+                unlabeled_views += 1
+                view_label = f"{previous_page_label}+{unlabeled_views}"
+            
+            if double_page_mode:
+                page_labels = dict(zip(sides, spread_page_labels(view_label)))
+            else:
+                page_labels = {'single': view_label}
+            
+            if label:
+                previous_page_label = page_labels[sides[-1]]
+            
+            # Process current page (or both halves of the spread)
+            for side in sides:
+                page_label = page_labels[side]
+                seen_pages[page_label] = {'label': label, 'side': side, 'page_label': page_label}
+                
+                if skip_existing and page_exists(page_label, directory):
+                    print(f"Page {page_label} already captured, skipping")
                     pages_processed += 1
-                else:
-                    errors_encountered += 1
-
-                success = process_right_page(driver, pages_processed)
-
+                    continue
+                
+                success = capture_page(driver, side, page_label, directory)
+                
+                if success is None:
+                    continue  # Nothing to capture on this side
+                
                 if success:
                     pages_processed += 1
                 else:
-                    errors_encountered += 1
+                    failed_pages.append({
+                        'label': label,
+                        'side': side,
+                        'page_label': page_label
+                    })
+                    return_to_viewer(driver)
+            
+            pages_seen = pages_processed + len(failed_pages)
+            if expected_pages and pages_seen:
+                remaining = max(expected_pages - pages_seen, 0)
+                eta = (time.time() - start_time) / pages_seen * remaining
+                print(f"Progress: {pages_seen}/{expected_pages} pages, ETA {eta:.0f}s")
+            
+            # Stop before going further over the budget; the pages saved so far can be resumed
+            if memory_budget_exceeded():
+                raise MemoryError(f"peak memory exceeded the {LARGE_BOOK['memory_budget_mb']} MiB budget")
             
             # Try to navigate to next page
             time.sleep(TIMEOUTS['post_click'])
@@ -619,95 +1194,486 @@ def process_book_pages(driver, double_page_mode):
         print(f"Page processing error: {e}")
         errors_encountered += 1
     
+    # Recapture corrupt pages while the browser session is still open
+    bad_pages, unreachable_pages = recapture_list(
+        directory, verify_pages(directory), read_manifest(directory), seen_pages
+    )
+    pages_processed -= len(bad_pages)  # Only pages seen in this run were counted
+    failed_pages.extend(bad_pages)
+    
+    # Retry queue: revisit failed pages instead of leaving gaps in the output
+    recovered, failed_pages = retry_failed_pages(driver, failed_pages, directory)
+    pages_processed += recovered
+    failed_pages.extend(unreachable_pages)
+    errors_encountered += len(failed_pages)
+    
     end_time = time.time()
     duration = end_time - start_time
     
     print(f"\nProcessing complete: {pages_processed} pages processed in {duration:.2f} seconds")
+    report_memory_usage()
+    
+    if expected_pages and pages_processed + len(failed_pages) < expected_pages:
+        print(f"⚠️  Expected {expected_pages} pages from the catalog; the end of the book may have been missed")
     
     return pages_processed, errors_encountered
 
 
 # ============================================================================
-# OUTPUT PROCESSING
+# PAGE VERIFICATION
 # ============================================================================
 
-def collect_image_files():
-    """Collect and sort image files numerically."""
-    try:
-        image_files = []
-        
-        for filename in os.listdir(TEMP_DIR):
-            if filename.endswith(f".{IMAGE_FORMAT}") and filename[:-4].isdigit():
-                image_files.append(os.path.join(TEMP_DIR, filename))
-        
-        # Sort numerically by filename
-        image_files.sort(key=lambda x: int(os.path.basename(x).split('.')[0]))
-        
-        return image_files
-        
-    except Exception as e:
-        print(f"Failed to collect image files: {e}")
-        return []
-
+def check_png(data):
+    """Check a PNG's signature, chunk CRCs and IHDR without decoding pixels.
 
-def sanitize_filename(filename):
-    """Sanitize filename for filesystem compatibility."""
-    if not filename:
-        return ""
-        
-    # Remove or replace problematic characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-        
-    # Limit length and strip whitespace
-    return filename.strip()[:200]
+    Returns (width, height); raises ValueError describing the first problem.
+    """
+    if bytes(data[:8]) != PNG_SIGNATURE:
+        raise ValueError("bad PNG signature")
+    
+    offset = 8
+    dimensions = None
+    
+    while offset + 12 <= len(data):
+        length, chunk_type = struct.unpack('>I4s', data[offset:offset + 8])
+        chunk_end = offset + 8 + length
+        if chunk_end + 4 > len(data):
+            raise ValueError(f"truncated {chunk_type.decode('latin-1')} chunk")
+        
+        chunk_data = data[offset + 8:chunk_end]
+        expected_crc, = struct.unpack('>I', data[chunk_end:chunk_end + 4])
+        if zlib.crc32(chunk_data, zlib.crc32(chunk_type)) != expected_crc:
+            raise ValueError(f"CRC mismatch in {chunk_type.decode('latin-1')} chunk")
+        
+        if dimensions is None:
+            if chunk_type != b'IHDR' or length != 13:
+                raise ValueError("IHDR is not the first chunk")
+            dimensions = struct.unpack('>II', chunk_data[:8])
+            if 0 in dimensions:
+                raise ValueError("zero image dimensions")
+        
+        if chunk_type == b'IEND':
+            return dimensions
+        
+        offset = chunk_end + 4
+    
+    raise ValueError("missing IEND chunk (truncated file)")
 
 
-def create_pdf(book_name):
-    """Create PDF from processed images."""
+def verify_page_file(file_path, entry=None):
+    """Verify one page file through a memory map; returns a problem description or None."""
     try:
-        print("Generating PDF... This may take a while.")
-        
-        # Collect and sort image files
-        image_files = collect_image_files()
-        if not image_files:
-            print("No image files found for PDF creation")
-            return False
-        
-        # Create backup BEFORE generating PDF (in case PDF generation fails)
-        create_backup(book_name)
-        
-        # Create PDF
-        pdf = FPDF(format=PDF_DIMENSIONS)
-        
-        for image_path in image_files:
+        with map_file(file_path) as data:
+            if entry:
+                if len(data) != entry['size']:
+                    return f"size {len(data)} does not match manifest ({entry['size']})"
+                if hashlib.sha256(data).hexdigest() != entry['sha256']:
+                    return "hash does not match manifest"
+            
             try:
-                pdf.add_page("P")
-                pdf.image(image_path, 0, 0, *PDF_DIMENSIONS)
-            except Exception as e:
-                print(f"Failed to add image {image_path} to PDF: {e}")
-                continue
-        
-        # Save PDF
-        pdf_filename = f"{book_name}.pdf"
-        pdf.output(pdf_filename)
-        
-        cleanup_temp_files()
-        
-        print(f"PDF '{pdf_filename}' created successfully!")
-        return True
-        
-    except Exception as e:
-        print(f"PDF creation failed: {e}")
-        return False
+                check_png(data)
+            except ValueError as e:
+                return str(e)
+            
+    except OSError as e:
+        return f"unreadable ({e})"
+    
+    return None
 
 
-def preserve_as_images(book_name, page_count):
-    """Preserve images as directory."""
-    try:
-        # Create backup BEFORE renaming (in case rename fails)
-        create_backup(book_name)
+def verify_workers(image_files):
+    """Pick the verification thread count; in large-book mode, fit the mapped pages in the budget."""
+    if not LARGE_BOOK['enabled'] or not image_files:
+        return VERIFY_WORKERS
+    
+    largest_page = max(os.path.getsize(path) for path in image_files) or 1
+    budget = LARGE_BOOK['memory_budget_mb'] << 20
+    return max(1, min(VERIFY_WORKERS, budget // (4 * largest_page)))
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of the process in MiB, or None if unknown.
+
+    On Linux, VmHWM is preferred: ru_maxrss keeps the peak of the parent
+    process across exec, so a small run started from a large one reads high.
+    """
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024  # KiB
+    except OSError:
+        pass
+    
+    if resource is None:
+        return None
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024  # bytes on macOS, KiB elsewhere
+
+
+def memory_budget_exceeded():
+    """Check whether the peak RSS has gone over the large-book memory budget."""
+    peak = peak_rss_mb()
+    return LARGE_BOOK['enabled'] and peak is not None and peak > LARGE_BOOK['memory_budget_mb']
+
+
+def report_memory_usage():
+    """Print the peak RSS; returns False when it exceeds the large-book memory budget."""
+    peak = peak_rss_mb()
+    if peak is None:
+        return True
+    
+    print(f"Peak memory (RSS): {peak:.0f} MiB")
+    
+    if memory_budget_exceeded():
+        print(f"❌ Peak memory exceeded the {LARGE_BOOK['memory_budget_mb']} MiB budget")
+        return False
+    
+    return True
+
+
+def verify_pages(directory=TEMP_DIR):
+    """Verify every page of a directory in parallel; returns {file name: problem}.
+
+    Hashing and CRCs release the GIL, so threads check pages concurrently.
+    """
+    manifest = read_manifest(directory)
+    image_files = collect_image_files(directory)
+    
+    with ThreadPoolExecutor(max_workers=verify_workers(image_files)) as executor:
+        problems = executor.map(
+            verify_page_file,
+            image_files,
+            [manifest.get(os.path.basename(path)) for path in image_files]
+        )
+        
+        return {
+            os.path.basename(path): problem
+            for path, problem in zip(image_files, problems)
+            if problem
+        }
+
+
+def recapture_list(directory, bad_files, manifest, seen_pages):
+    """Turn bad page files into retry queue entries, removing the bad files.
+
+    Returns (bad pages to retry, pages that cannot be recaptured). Pages not
+    seen in this session cannot be navigated back to by spread label, so
+    they are reported as failed straight away instead of being retried.
+    """
+    bad_pages = []
+    unreachable_pages = []
+    
+    for filename, problem in sorted(bad_files.items()):
+        entry = manifest.get(filename)
+        page_label = entry['label'] if entry else filename
+        
+        if page_label in seen_pages:
+            print(f"Page {page_label} is corrupt ({problem}), queued for recapture")
+            bad_pages.append(seen_pages[page_label])
+        else:
+            print(f"Page {page_label} is corrupt ({problem}) but was not visited in this run; "
+                  f"resume the capture to replace it")
+            unreachable_pages.append({'label': None, 'side': 'single', 'page_label': page_label})
+        
+        try:
+            os.unlink(os.path.join(directory, filename))
+        except OSError:
+            pass
+    
+    return bad_pages, unreachable_pages
+
+
+# ============================================================================
+# OUTPUT PROCESSING
+# ============================================================================
+
+def image_sort_key(filename):
+    """Return the sort key of a page file name, or None if it is not a page.
+
+    Plain numeric names from older backups are treated as numbered pages.
+    """
+    match = PAGE_FILE_PATTERN.match(filename)
+    if match:
+        return match.group(1)
+    
+    stem, extension = os.path.splitext(filename)
+    if extension == f".{IMAGE_FORMAT}" and stem.isdigit():
+        return f"2{int(stem):05d}"
+    
+    return None
+
+
+def collect_image_files(directory=TEMP_DIR):
+    """Collect image files sorted in reading order by page label."""
+    try:
+        keyed_files = []
+        
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                sort_key = image_sort_key(entry.name)
+                if sort_key is not None and entry.is_file():
+                    keyed_files.append((sort_key, entry.name, entry.path))
+        
+        keyed_files.sort()
+        
+        return [path for _, _, path in keyed_files]
+        
+    except Exception as e:
+        print(f"Failed to collect image files: {e}")
+        return []
+
+
+def captured_page_labels(directory=TEMP_DIR):
+    """List the labels of the pages in a directory, in reading order."""
+    manifest = read_manifest(directory)
+    labels = []
+    
+    for image_path in collect_image_files(directory):
+        entry = manifest.get(os.path.basename(image_path))
+        if entry:
+            labels.append(entry['label'])
+    
+    return labels
+
+
+def page_label_from_filename(filename):
+    """Recover the viewer label from a page file name, or None for old numeric names."""
+    match = PAGE_FILE_PATTERN.match(filename)
+    if not match:
+        return None
+    
+    return os.path.splitext(filename)[0][len(match.group(1)) + 1:]
+
+
+def pdf_page_label(label):
+    """Map a viewer page label to a PDF page label (style, prefix, start).
+
+    Numbered labels keep their number so viewers can jump to a printed page;
+    labels without a number are used verbatim.
+    """
+    match = re.match(r'^([A-Za-z]*)(\d+)$', label)
+    if match and int(match.group(2)) > 0:
+        return 'D', match.group(1) or None, int(match.group(2))
+    
+    if label and ROMAN_NUMERAL_PATTERN.match(label.upper()):
+        return 'r' if label.islower() else 'R', None, roman_to_int(label.upper())
+    
+    return None, label, None
+
+
+def read_png_dimensions(image):
+    """Read the width and height of a PNG path or file object from its IHDR."""
+    if isinstance(image, str):
+        with open(image, 'rb') as f:
+            header = f.read(24)
+    else:
+        header = image.read(24)
+        image.seek(0)
+    
+    if header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+        raise ValueError("not a PNG file")
+    
+    return struct.unpack('>II', header[16:24])
+
+
+def is_archive(source):
+    """Check whether a page source is an archive rather than a directory."""
+    return os.path.isfile(source) and zipfile.is_zipfile(source)
+
+
+def list_archive_pages(archive):
+    """List the page entries of an open archive in reading order.
+
+    A page recaptured during streaming appears twice; the last copy wins.
+    """
+    keyed_names = []
+    
+    for name in dict.fromkeys(archive.namelist()):
+        sort_key = image_sort_key(os.path.basename(name))
+        if sort_key is not None:
+            keyed_names.append((sort_key, name))
+    
+    keyed_names.sort()
+    
+    return [name for _, name in keyed_names]
+
+
+def iter_page_images(source):
+    """Yield (name, image) pairs in reading order from a directory or archive.
+
+    Directory pages are yielded as paths. Archive pages are read straight
+    from the archive through its central index.
+    """
+    if is_archive(source):
+        with zipfile.ZipFile(source) as archive:
+            for name in list_archive_pages(archive):
+                yield name, io.BytesIO(archive.read(name))
+    else:
+        for image_path in collect_image_files(source):
+            yield image_path, image_path
+
+
+def count_pages(source):
+    """Count the pages available in a directory or archive."""
+    if is_archive(source):
+        with zipfile.ZipFile(source) as archive:
+            return len(list_archive_pages(archive))
+    return len(collect_image_files(source))
+
+
+def write_archive(directory, archive_path):
+    """Pack the pages of a directory into a stored CBZ archive."""
+    image_files = collect_image_files(directory)
+    
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_STORED) as archive:
+        for image_path in image_files:
+            archive.write(image_path, os.path.basename(image_path))
+    
+    return len(image_files)
+
+
+def sanitize_filename(filename):
+    """Sanitize filename for filesystem compatibility."""
+    if not filename:
+        return ""
+        
+    # Remove or replace problematic characters
+    invalid_chars = '<>:"/\\|?*'
+    for char in invalid_chars:
+        filename = filename.replace(char, '_')
+        
+    # Limit length and strip whitespace
+    return filename.strip()[:200]
+
+
+def make_thumbnail(image):
+    """Downscale a page image to raw RGB thumbnail data: (width, height, bytes)."""
+    from PIL import Image
+    
+    with Image.open(image) as page_image:
+        page_image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        thumbnail = page_image.convert('RGB')
+    
+    if not isinstance(image, str):
+        image.seek(0)
+    
+    return thumbnail.width, thumbnail.height, thumbnail.tobytes()
+
+
+def add_fast_view_page(pdf, name, image, layout):
+    """Add a page sized to its image and labelled like the viewer.
+
+    layout carries the current outline section and collects the thumbnail
+    of every page added.
+    """
+    width, height = (pixels * 72 / PDF_DPI for pixels in read_png_dimensions(image))
+    filename = os.path.basename(name)
+    label = page_label_from_filename(filename)
+    
+    try:
+        thumbnail = make_thumbnail(image)
+    except Exception:
+        thumbnail = None  # The page is still usable without it
+    
+    if label:
+        label_style, label_prefix, label_start = pdf_page_label(label)
+        pdf.add_page(format=(width, height), label_style=label_style,
+                     label_prefix=label_prefix, label_start=label_start)
+    else:
+        pdf.add_page(format=(width, height))
+    
+    layout['thumbnails'].append(thumbnail)
+    
+    section = OUTLINE_SECTIONS.get(image_sort_key(filename)[0])
+    if section != layout['section']:
+        pdf.start_section(section)
+        layout['section'] = section
+    
+    pdf.image(image, 0, 0, width, height)
+
+
+def optimize_pdf_for_fast_view(pdf_filename, thumbnails):
+    """Embed page thumbnails and linearize a PDF, when pikepdf is installed."""
+    try:
+        import pikepdf
+    except ImportError:
+        print("pikepdf is not installed: PDF left without linearization and thumbnails")
+        return False
+    
+    with pikepdf.open(pdf_filename, allow_overwriting_input=True) as pdf:
+        for page, thumbnail in zip(pdf.pages, thumbnails):
+            if thumbnail:
+                width, height, data = thumbnail
+                page.obj.Thumb = pikepdf.Stream(
+                    pdf, zlib.compress(data),
+                    Width=width, Height=height, BitsPerComponent=8,
+                    ColorSpace=pikepdf.Name.DeviceRGB, Filter=pikepdf.Name.FlateDecode
+                )
+        
+        pdf.save(pdf_filename, linearize=True)
+    
+    return True
+
+
+def create_pdf(book_name, source=TEMP_DIR, fast_view=False):
+    """Create PDF from processed images in a directory or archive.
+
+    In fast view mode pages are sized from their images and carry the
+    viewer's page labels, an outline lists the cover, front matter, pages,
+    annexes and back cover, and (with pikepdf) the file is linearized with
+    embedded thumbnails. The source is only read; backing up and cleaning up
+    captured pages is left to the caller.
+    """
+    from fpdf import FPDF
+    
+    try:
+        print("Generating PDF... This may take a while.")
+        
+        if not count_pages(source):
+            print("No image files found for PDF creation")
+            return False
+        
+        # Create PDF
+        if fast_view:
+            pdf = FPDF(unit='pt')
+            pdf.set_auto_page_break(False)
+            layout = {'section': None, 'thumbnails': []}
+        else:
+            pdf = FPDF(format=PDF_DIMENSIONS)
+        
+        for name, image in iter_page_images(source):
+            try:
+                if fast_view:
+                    add_fast_view_page(pdf, name, image, layout)
+                else:
+                    pdf.add_page("P")
+                    pdf.image(image, 0, 0, *PDF_DIMENSIONS)
+            except Exception as e:
+                print(f"Failed to add image {name} to PDF: {e}")
+                continue
+        
+        # Save PDF
+        pdf_filename = f"{book_name}.pdf"
+        pdf.output(pdf_filename)
+        
+        if fast_view:
+            optimize_pdf_for_fast_view(pdf_filename, layout['thumbnails'])
+        
+        print(f"PDF '{pdf_filename}' created successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"PDF creation failed: {e}")
+        return False
+
+
+def preserve_as_images(book_name, page_count):
+    """Preserve images as directory."""
+    try:
+        # Create backup BEFORE renaming (in case rename fails)
+        create_backup(book_name)
         
         target_dir = sanitize_filename(book_name) or DEFAULT_BOOK_NAME
         
@@ -731,13 +1697,164 @@ def preserve_as_images(book_name, page_count):
             return False
 
 
-def create_backup(book_name):
-    """Create backup of processed images."""
+def streamed_archive_is_current(directory):
+    """Check that the streamed archive holds exactly the directory's pages, once each."""
+    archive_path = os.path.join(directory, STREAM_ARCHIVE_NAME)
+    if not os.path.exists(archive_path):
+        return False
+    
+    with zipfile.ZipFile(archive_path) as archive:
+        names = archive.namelist()
+    
+    page_names = {os.path.basename(path) for path in collect_image_files(directory)}
+    return len(names) == len(set(names)) and set(names) == page_names
+
+
+def preserve_as_archive(book_name, directory=TEMP_DIR):
+    """Keep the pages as a single CBZ archive."""
+    try:
+        # Create backup BEFORE moving pages (in case packing fails)
+        create_backup(book_name, directory)
+        
+        archive_path = f"{sanitize_filename(book_name) or DEFAULT_BOOK_NAME}.{ARCHIVE_FORMAT}"
+        streamed_archive = os.path.join(directory, STREAM_ARCHIVE_NAME)
+        
+        if streamed_archive_is_current(directory):
+            os.replace(streamed_archive, archive_path)
+            page_count = count_pages(archive_path)
+        else:
+            page_count = write_archive(directory, archive_path)
+        
+        cleanup_temp_files(directory)
+        
+        print(f"Pages preserved in '{archive_path}' ({page_count} pages)")
+        return True
+        
+    except Exception as e:
+        print(f"Failed to create archive: {e}")
+        return False
+
+
+def reflink_file(source_path, target_path):
+    """Clone a file with a copy-on-write reflink where the filesystem allows it."""
+    if fcntl is None:
+        return False
+    
+    try:
+        with open(source_path, 'rb') as source, open(target_path, 'wb') as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        return True
+    except OSError:
+        if os.path.exists(target_path):
+            os.unlink(target_path)
+        return False
+
+
+def copy_file_chunked(source_path, target_path):
+    """Copy a file in chunks, in the kernel when copy_file_range is available."""
+    with open(source_path, 'rb') as source, open(target_path, 'wb') as target:
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while os.copy_file_range(source.fileno(), target.fileno(), BACKUP_CHUNK_SIZE):
+                    pass
+                shutil.copystat(source_path, target_path)
+                return
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                    raise
+                source.seek(0)
+                target.seek(0)
+                target.truncate()
+        
+        shutil.copyfileobj(source, target, BACKUP_CHUNK_SIZE)
+    
+    shutil.copystat(source_path, target_path)
+
+
+def clone_directory(source_dir, target_dir):
+    """Populate target_dir with the files of source_dir, sharing data when possible.
+
+    Pages are hard-linked, or reflinked when links are not possible. This is
+    safe because pages are only ever replaced, never modified in place. The
+    manifest and the streamed archive are appended to in place, so they are
+    reflinked or copied instead. The remaining files are copied in parallel.
+    Returns a dict of file names per method.
+    """
+    os.makedirs(target_dir)
+    methods = {'linked': [], 'reflinked': [], 'copied': []}
+    
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            if not entry.is_file() or entry.name.startswith('.'):
+                continue  # Skip unfinished temp files
+            
+            target_path = os.path.join(target_dir, entry.name)
+            
+            # Files appended to in place must not share an inode with the backup
+            if entry.name not in (MANIFEST_NAME, STREAM_ARCHIVE_NAME):
+                try:
+                    os.link(entry.path, target_path)
+                    methods['linked'].append(entry.name)
+                    continue
+                except OSError:
+                    pass
+            
+            if reflink_file(entry.path, target_path):
+                methods['reflinked'].append(entry.name)
+            else:
+                methods['copied'].append(entry.name)
+    
+    with ThreadPoolExecutor(max_workers=BACKUP_COPY_WORKERS) as executor:
+        list(executor.map(
+            copy_file_chunked,
+            [os.path.join(source_dir, name) for name in methods['copied']],
+            [os.path.join(target_dir, name) for name in methods['copied']]
+        ))
+    
+    return methods
+
+
+def hash_file(file_path):
+    """Compute the SHA-256 of a file."""
+    digest = hashlib.sha256()
+    
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(BACKUP_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    
+    return digest.hexdigest()
+
+
+def verify_backup(backup_path, copied_files):
+    """Check backed up pages against the manifest; returns the bad file names.
+
+    Linked and reflinked pages share their data with the source, so their
+    size is enough. Copied pages are hashed.
+    """
+    copied_files = set(copied_files)
+    bad_files = []
+    
+    for filename, entry in read_manifest(backup_path).items():
+        file_path = os.path.join(backup_path, filename)
+        
+        try:
+            if os.path.getsize(file_path) != entry['size']:
+                bad_files.append(filename)
+            elif filename in copied_files and hash_file(file_path) != entry['sha256']:
+                bad_files.append(filename)
+        except OSError:
+            bad_files.append(filename)
+    
+    return bad_files
+
+
+def create_backup(book_name, directory=TEMP_DIR):
+    """Create backup of processed images; returns the backup path."""
     try:
         if not os.path.exists(SAVE_DIR):
             os.makedirs(SAVE_DIR)
         
-        if os.path.exists(TEMP_DIR):
+        if os.path.exists(directory):
             backup_name = sanitize_filename(book_name) or f"backup_{int(time.time())}"
             backup_path = os.path.join(SAVE_DIR, backup_name)
             
@@ -748,45 +1865,180 @@ def create_backup(book_name):
                 backup_path = f"{original_backup_path}_{counter}"
                 counter += 1
             
-            shutil.copytree(TEMP_DIR, backup_path)
-            print(f"Backup created: {backup_path}")
+            methods = clone_directory(directory, backup_path)
+            print(f"Backup created: {backup_path} ({len(methods['linked'])} linked, "
+                  f"{len(methods['reflinked'])} reflinked, {len(methods['copied'])} copied)")
+            
+            bad_files = verify_backup(backup_path, methods['copied'])
+            if bad_files:
+                print(f"⚠️  Backup integrity check failed for: {', '.join(sorted(bad_files))}")
+            
+            return backup_path
             
     except Exception as e:
         print(f"Backup creation failed: {e}")
+    
+    return None
 
 
-def cleanup_temp_files():
+def cleanup_temp_files(directory=TEMP_DIR):
     """Clean up temporary files."""
     try:
-        if os.path.exists(TEMP_DIR):
-            shutil.rmtree(TEMP_DIR)
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
             print("Temporary files cleaned up")
     except Exception as e:
         print(f"Cleanup warning: {e}")
 
 
-def process_output(book_name, page_count):
-    """Process output based on user preference."""
-    print("\nOutput Options:")
-    print("1. Generate PDF from pages")
-    print("2. Keep as image directory")
-    print("3. Save backup and quit")
+def create_pdf_from_capture(book_name, fast_view=False):
+    """Back up the captured pages, build the PDF, then remove the pages."""
+    # Create backup BEFORE generating PDF (in case PDF generation fails)
+    create_backup(book_name)
+    
+    if not create_pdf(book_name, TEMP_DIR, fast_view):
+        return False
+    
+    cleanup_temp_files()
+    return True
+
+
+def pdf_output_allowed():
+    """PDF output is refused in large-book mode: fpdf2 keeps every page in memory until output()."""
+    if not LARGE_BOOK['enabled']:
+        return True
     
-    choice = input("\nSelect option (1, 2, or 3): ").strip()
+    print(f"❌ PDF output does not fit the --memory-budget: keep the pages as a {ARCHIVE_FORMAT.upper()} "
+          f"archive and run build-pdf on it separately")
+    return False
+
+
+def process_output(book_name, page_count, choice=None):
+    """Process output based on user preference, or on a preset choice (1-5)."""
+    if choice is None:
+        print("\nOutput Options:")
+        print("1. Generate PDF from pages")
+        print("2. Keep as image directory")
+        print("3. Save backup and quit")
+        print(f"4. Keep as {ARCHIVE_FORMAT.upper()} archive")
+        print("5. Generate fast-opening PDF (page labels, outline, linearized)")
+        
+        choice = input("\nSelect option (1, 2, 3, 4, or 5): ").strip()
+        
+        if choice in ("1", "5") and not pdf_output_allowed():
+            return process_output(book_name, page_count)
     
     if choice == "1":
-        return create_pdf(book_name)
+        return create_pdf_from_capture(book_name)
     elif choice == "2":
         return preserve_as_images(book_name, page_count)
     elif choice == "3":
         create_backup(book_name)
         print("Session completed successfully!")
         return True
+    elif choice == "4":
+        return preserve_as_archive(book_name)
+    elif choice == "5":
+        return create_pdf_from_capture(book_name, fast_view=True)
     else:
-        print("Invalid option. Please choose 1, 2, or 3.")
+        print("Invalid option. Please choose 1, 2, 3, 4, or 5.")
         return process_output(book_name, page_count)  # Recursive retry
 
 
+# ============================================================================
+# LIBRARY CATALOG
+# ============================================================================
+
+def load_catalog(catalog_path=CATALOG_PATH):
+    """Load the library catalog, or an empty one if missing or unreadable."""
+    try:
+        with open(catalog_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'updated': 0, 'books': []}
+
+
+def save_catalog(catalog, catalog_path=CATALOG_PATH):
+    """Write the library catalog to disk."""
+    try:
+        os.makedirs(os.path.dirname(catalog_path) or '.', exist_ok=True)
+        data = json.dumps(catalog, indent=2, ensure_ascii=False).encode('utf-8')
+        write_file_atomic(catalog_path, data)
+    except Exception as e:
+        print(f"Could not save catalog: {e}")
+
+
+def catalog_is_fresh(catalog):
+    """Check whether the catalogued book list is recent enough to trust."""
+    return bool(catalog['books']) and time.time() - catalog['updated'] < CATALOG_TTL
+
+
+def update_catalog_books(catalog, books):
+    """Record discovered books, keeping the page data of books still listed."""
+    known_books = {book['title']: book for book in catalog['books']}
+    
+    catalog['books'] = [{
+        'index': book['index'],
+        'title': book['title'],
+        'volumes': known_books.get(book['title'], {}).get('volumes', {})
+    } for book in books]
+    catalog['updated'] = time.time()
+
+
+def catalog_books(catalog):
+    """Build the book list from the catalog; elements are located on demand."""
+    return [{
+        'index': book['index'],
+        'title': book['title'],
+        'element': None
+    } for book in catalog['books']]
+
+
+def find_book(books, requested_book):
+    """Find a book by index or case-insensitive title."""
+    requested = requested_book.strip().lower()
+    
+    for book in books:
+        if requested == str(book['index']) or requested == book['title'].lower():
+            return book
+    
+    return None
+
+
+def find_catalog_volume(catalog, book_title, volume_name):
+    """Return the catalogued page data of a book volume, if any."""
+    for book in catalog['books']:
+        if book['title'] == book_title:
+            return book['volumes'].get(volume_name or '')
+    return None
+
+
+def record_page_labels(catalog, book_title, volume_name, labels):
+    """Record the page count and labels of a captured book volume."""
+    for book in catalog['books']:
+        if book['title'] == book_title:
+            book['volumes'][volume_name or ''] = {
+                'page_count': len(labels),
+                'labels': labels
+            }
+
+
+def resolve_book_element(driver, catalog, book):
+    """Locate a book's element, rediscovering the library if the catalog is stale."""
+    element = locate_book_element(driver, book)
+    if element is not None:
+        return element
+    
+    print("Catalog is out of date, discovering books again...")
+    books = discover_books(driver)
+    if books:
+        update_catalog_books(catalog, books)
+        save_catalog(catalog)
+    
+    match = find_book(books, book['title'])
+    return match['element'] if match else None
+
+
 # ============================================================================
 # USER INTERACTION
 # ============================================================================
@@ -821,20 +2073,673 @@ def confirm_book_selection(book):
     confirmation = input(f"\n📖 Backup '{book['title']}'? (yes/no): ").lower().strip()
     return confirmation in ('yes', 'y')
 
+def resume_selection(resume=None):
+    """Offer to resume from pages left over by a previous run; resume=True/False skips the prompt."""
+    leftover_pages = collect_image_files() if os.path.exists(TEMP_DIR) else []
+    if not leftover_pages:
+        return False
+    
+    if resume is None:
+        answer = input(f"\nFound {len(leftover_pages)} pages from a previous run. Resume? (yes/no): ").lower().strip()
+        resume = answer in ('yes', 'y')
+    
+    if resume:
+        print(f"Resuming from {len(leftover_pages)} pages of a previous run")
+        return True
+    
+    cleanup_temp_files()
+    return False
+
+
 def double_page_mode_selection():
     anwser = input("\nUse double page mode? (yes/no): ").lower().strip()
     return anwser in ('yes', 'y')
 
 
+def archive_mode_selection():
+    """Ask whether pages should be streamed into an archive while capturing."""
+    answer = input(f"\nStream pages into a {ARCHIVE_FORMAT.upper()} archive while capturing? (yes/no): ").lower().strip()
+    return answer in ('yes', 'y')
+
+
+# ============================================================================
+# DAEMON MODE
+# ============================================================================
+
+def create_daemon_state(pool_size, token):
+    """Create the shared state of the daemon: job table, queue and metrics."""
+    return {
+        'pool_size': pool_size,
+        'token': token,
+        'jobs': {},
+        'queue': queue.PriorityQueue(),
+        'sequence': itertools.count(1),
+        'lock': threading.Lock(),
+        'catalog_lock': threading.Lock(),
+        'metrics': {
+            'drivers_started': 0,
+            'driver_restarts': 0,
+            'drivers_alive': 0,
+            'jobs_requeued': 0,
+            'pages_captured': 0,
+            'job_seconds': {'capture': 0.0, 'build': 0.0},
+            'jobs_finished': {'capture': 0, 'build': 0}
+        }
+    }
+
+
+def validate_job_params(params):
+    """Check a job request; returns an error message or None."""
+    if not isinstance(params, dict):
+        return "Job must be a JSON object"
+    
+    job_type = params.get('type')
+    if job_type == 'capture' and params.get('book') in (None, ''):
+        return "Capture jobs need a 'book' (index or title)"
+    if job_type == 'build' and not params.get('source'):
+        return "Build jobs need a 'source' (page directory or archive)"
+    if job_type not in ('capture', 'build'):
+        return "Job type must be 'capture' or 'build'"
+    if params.get('output', 'pdf') not in JOB_OUTPUTS:
+        return f"Output must be one of: {', '.join(JOB_OUTPUTS)}"
+    if not isinstance(params.get('priority', 0), int):
+        return "Priority must be an integer (lower runs first)"
+    if not isinstance(params.get('name', ''), str):
+        return "Name must be a string"
+    if job_type == 'build' and not is_saved_source(str(params['source'])):
+        return f"Build sources must be inside '{SAVE_DIR}/'"
+    
+    return None
+
+
+def is_saved_source(source):
+    """Check that a build source resolves to a path inside SAVE_DIR."""
+    save_dir = os.path.realpath(SAVE_DIR)
+    source_path = os.path.realpath(source)
+    return os.path.commonpath([save_dir, source_path]) == save_dir and source_path != save_dir
+
+
+def enqueue_job(state, job):
+    """Put a job on the priority queue."""
+    state['queue'].put((job['priority'], next(state['sequence']), job['id']))
+
+
+def submit_job(state, params):
+    """Register a new job and queue it."""
+    with state['lock']:
+        job_id = uuid.uuid4().hex[:12]  # Unique across restarts, so job directories are never shared
+        job = {
+            'id': job_id,
+            'type': params['type'],
+            'priority': params.get('priority', 0),
+            'params': params,
+            'state': 'queued',
+            'attempts': 0,
+            'worker': None,
+            'directory': os.path.join(DAEMON['jobs_dir'], job_id),
+            'created': time.time(),
+            'started': None,
+            'finished': None,
+            'error': None,
+            'result': None
+        }
+        state['jobs'][job_id] = job
+    
+    enqueue_job(state, job)
+    return job
+
+
+def job_summary(job):
+    """Describe a job for the API, including live capture progress."""
+    summary = {key: value for key, value in job.items() if key != 'directory'}
+    
+    if job['type'] == 'capture' and job['state'] == 'running' and os.path.exists(job['directory']):
+        summary['pages_captured'] = len(collect_image_files(job['directory']))
+    
+    return summary
+
+
+def daemon_metrics(state):
+    """Summarise queue, pool and job metrics."""
+    with state['lock']:
+        jobs = list(state['jobs'].values())
+        metrics = json.loads(json.dumps(state['metrics']))
+    
+    metrics['queue_depth'] = state['queue'].qsize()
+    metrics['pool_size'] = state['pool_size']
+    metrics['jobs'] = {}
+    for job in jobs:
+        metrics['jobs'][job['state']] = metrics['jobs'].get(job['state'], 0) + 1
+    
+    for job_type, finished in metrics['jobs_finished'].items():
+        seconds = metrics['job_seconds'][job_type]
+        metrics[f'{job_type}_average_seconds'] = round(seconds / finished, 2) if finished else None
+    
+    return metrics
+
+
+def start_pool_driver(state, base_url):
+    """Start and log in a headless driver for the pool; None on failure."""
+    driver = None
+    
+    try:
+        driver = create_driver(headless=True, detach=False)
+        if not authenticate(driver, base_url=base_url):
+            raise RuntimeError("authentication failed")
+        
+        with state['lock']:
+            state['metrics']['drivers_started'] += 1
+            state['metrics']['drivers_alive'] += 1
+        return driver
+        
+    except Exception as e:
+        print(f"Could not start pool driver: {e}")
+        if driver:
+            stop_pool_driver(state, driver, counted=False)
+        return None
+
+
+def stop_pool_driver(state, driver, counted=True):
+    """Quit a pool driver, ignoring errors from a crashed browser."""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    
+    if counted:
+        with state['lock']:
+            state['metrics']['drivers_alive'] -= 1
+
+
+def driver_is_alive(driver):
+    """Check that the browser behind a driver still answers."""
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+def reset_driver_windows(driver):
+    """Close every window but the library so the next job starts clean."""
+    handles = driver.window_handles
+    
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    
+    driver.switch_to.window(handles[0])
+
+
+def run_capture_job(driver, job, state):
+    """Capture a book for a job; pages already on disk from a failed attempt are kept."""
+    params = job['params']
+    directory = job['directory']
+    
+    # Only a re-queued attempt resumes; anything else on disk is not this job's
+    if job['attempts'] == 1:
+        cleanup_temp_files(directory)
+    
+    with state['catalog_lock']:
+        catalog = load_catalog()
+        
+        if params.get('refresh') or not catalog_is_fresh(catalog):
+            books = discover_books(driver)
+            if books:
+                update_catalog_books(catalog, books)
+                save_catalog(catalog)
+        else:
+            books = catalog_books(catalog)
+        
+        book = find_book(books, str(params['book']))
+        if not book:
+            raise RuntimeError(f"Book '{params['book']}' not found")
+        
+        if book['element'] is None:
+            book['element'] = resolve_book_element(driver, catalog, book)
+            if book['element'] is None:
+                raise RuntimeError(f"Could not find '{book['title']}' in the library")
+    
+    volume_name = select_book_and_volume(driver, book, params.get('volume'), interactive=False)
+    if volume_name is None:
+        raise RuntimeError("Book or volume selection failed")
+    volume_name = None if volume_name == "None" else volume_name
+    
+    double_page_mode = bool(params.get('double_page'))
+    
+    if not open_book_viewer(driver):
+        raise RuntimeError("Failed to open book viewer")
+    if not set_view_mode(driver, double_page_mode):
+        raise RuntimeError("Failed to set page view")
+    
+    known_volume = find_catalog_volume(catalog, book['title'], volume_name)
+    expected_pages = known_volume['page_count'] if known_volume else None
+    output = params.get('output', 'pdf')
+    
+    ensure_output_directory(directory)
+    if output == ARCHIVE_FORMAT:
+        open_page_archive(directory)
+    
+    try:
+        pages_processed, errors_encountered = process_book_pages(
+            driver, double_page_mode, True, expected_pages, directory
+        )
+    finally:
+        close_page_archive(directory)
+    
+    # A browser crash ends the capture early; let the job be retried
+    if not driver_is_alive(driver):
+        raise RuntimeError("Browser crashed during capture")
+    if pages_processed == 0:
+        raise RuntimeError("No pages were processed successfully")
+    
+    book_name = sanitize_filename(volume_name or book['title']) or DEFAULT_BOOK_NAME
+    
+    with state['catalog_lock']:
+        if errors_encountered == 0:
+            catalog = load_catalog()
+            record_page_labels(catalog, book['title'], volume_name, captured_page_labels(directory))
+            save_catalog(catalog)
+    
+    with state['lock']:
+        state['metrics']['pages_captured'] += pages_processed
+    
+    return {
+        'book': book_name,
+        'pages': pages_processed,
+        'errors': errors_encountered,
+        'output': finish_job_output(book_name, directory, output, params)
+    }
+
+
+def finish_job_output(book_name, directory, output, job_params):
+    """Back up captured pages and produce the requested output; returns its path."""
+    if output == ARCHIVE_FORMAT:
+        if not preserve_as_archive(book_name, directory):
+            raise RuntimeError("Failed to create archive")
+        return f"{sanitize_filename(book_name) or DEFAULT_BOOK_NAME}.{ARCHIVE_FORMAT}"
+    
+    backup_path = create_backup(book_name, directory)
+    
+    if output == 'pdf':
+        if not create_pdf(book_name, directory, bool(job_params.get('fast_view'))):
+            raise RuntimeError("PDF creation failed")
+        cleanup_temp_files(directory)
+        return f"{book_name}.pdf"
+    
+    cleanup_temp_files(directory)
+    return backup_path
+
+
+def run_build_job(job):
+    """Build a PDF or archive from saved pages."""
+    params = job['params']
+    source = params['source'].rstrip('/\\')
+    output = params.get('output', 'pdf')
+    book_name = sanitize_filename(params.get('name') or os.path.splitext(os.path.basename(source))[0])
+    book_name = book_name or DEFAULT_BOOK_NAME
+    
+    if output == 'pdf':
+        if not create_pdf(book_name, source, bool(params.get('fast_view'))):
+            raise RuntimeError("PDF creation failed")
+        return {'output': f"{book_name}.pdf"}
+    
+    if output == ARCHIVE_FORMAT:
+        archive_path = f"{sanitize_filename(book_name) or DEFAULT_BOOK_NAME}.{ARCHIVE_FORMAT}"
+        if not write_archive(source, archive_path):
+            raise RuntimeError(f"No pages found in '{source}'")
+        return {'output': archive_path}
+    
+    raise RuntimeError("Build jobs produce 'pdf' or archive output")
+
+
+def finish_job(state, job, job_state, result=None, error=None):
+    """Record the outcome of a job attempt."""
+    with state['lock']:
+        job['state'] = job_state
+        job['result'] = result
+        job['error'] = error
+        
+        if job_state in ('done', 'failed'):
+            job['finished'] = time.time()
+            state['metrics']['jobs_finished'][job['type']] += 1
+            state['metrics']['job_seconds'][job['type']] += job['finished'] - job['started']
+        elif job_state == 'queued':
+            state['metrics']['jobs_requeued'] += 1
+
+
+def daemon_worker(state, worker_id, base_url):
+    """Serve queued jobs with one warm, logged-in driver.
+
+    When the browser crashes, the capture job is re-queued so that another
+    driver (or this one, restarted) can resume it from the pages on disk.
+    """
+    driver = start_pool_driver(state, base_url)
+    
+    while True:
+        _, _, job_id = state['queue'].get()
+        if job_id is None:
+            break  # Shutdown
+        
+        job = state['jobs'][job_id]
+        
+        with state['lock']:
+            job['state'] = 'running'
+            job['worker'] = worker_id
+            job['attempts'] += 1
+            job['started'] = job['started'] or time.time()
+        
+        try:
+            if job['type'] == 'build':
+                result = run_build_job(job)
+            else:
+                if driver is None:
+                    driver = start_pool_driver(state, base_url)
+                    if driver is None:
+                        raise RuntimeError("No browser available")
+                
+                try:
+                    result = run_capture_job(driver, job, state)
+                finally:
+                    if driver_is_alive(driver):
+                        reset_driver_windows(driver)
+            
+            finish_job(state, job, 'done', result=result)
+            print(f"Job {job_id} done")
+            
+        except Exception as e:
+            crashed = job['type'] == 'capture' and (driver is None or not driver_is_alive(driver))
+            
+            if crashed and driver is not None:
+                stop_pool_driver(state, driver)
+                driver = None
+                with state['lock']:
+                    state['metrics']['driver_restarts'] += 1
+            
+            if crashed and job['attempts'] < DAEMON['max_attempts']:
+                delay = RETRY['backoff_base'] ** job['attempts']
+                print(f"Job {job_id} lost its browser ({e}); re-queued in {delay}s")
+                finish_job(state, job, 'queued', error=str(e))
+                
+                # Re-enqueue later without holding this worker through the backoff
+                timer = threading.Timer(delay, enqueue_job, args=(state, job))
+                timer.daemon = True
+                timer.start()
+            else:
+                print(f"Job {job_id} failed: {e}")
+                finish_job(state, job, 'failed', error=str(e))
+                if job['type'] == 'capture':
+                    cleanup_temp_files(job['directory'])
+    
+    if driver is not None:
+        stop_pool_driver(state, driver)
+
+
+def make_request_handler(state):
+    """Build the HTTP handler class serving the job API."""
+    from http.server import BaseHTTPRequestHandler
+    
+    class JobRequestHandler(BaseHTTPRequestHandler):
+        """GET /jobs, GET /jobs/<id>, GET /metrics and POST /jobs.
+
+        Every request needs the daemon's bearer token, and POST bodies must be
+        sent as application/json so that web pages cannot submit jobs.
+        """
+        
+        def is_authorized(self):
+            expected = f"Bearer {state['token']}"
+            return hmac.compare_digest(self.headers.get('Authorization', ''), expected)
+        
+        def send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def do_GET(self):
+            path = self.path.rstrip('/')
+            
+            if not self.is_authorized():
+                self.send_json(401, {'error': "Missing or invalid token"})
+            elif path == '/jobs':
+                with state['lock']:
+                    jobs = list(state['jobs'].values())
+                self.send_json(200, [job_summary(job) for job in jobs])
+            elif path.startswith('/jobs/'):
+                job = state['jobs'].get(path[len('/jobs/'):])
+                if job:
+                    self.send_json(200, job_summary(job))
+                else:
+                    self.send_json(404, {'error': "Unknown job"})
+            elif path == '/metrics':
+                self.send_json(200, daemon_metrics(state))
+            else:
+                self.send_json(404, {'error': "Unknown endpoint"})
+        
+        def do_POST(self):
+            if self.path.rstrip('/') != '/jobs':
+                self.send_json(404, {'error': "Unknown endpoint"})
+                return
+            if not self.is_authorized():
+                self.send_json(401, {'error': "Missing or invalid token"})
+                return
+            
+            content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type != 'application/json':
+                self.send_json(415, {'error': "Content-Type must be application/json"})
+                return
+            
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                params = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self.send_json(400, {'error': "Body must be JSON"})
+                return
+            
+            error = validate_job_params(params)
+            if error:
+                self.send_json(400, {'error': error})
+                return
+            
+            self.send_json(202, job_summary(submit_job(state, params)))
+        
+        def log_message(self, format, *args):
+            pass  # Keep the daemon output to job progress
+    
+    return JobRequestHandler
+
+
+def run_daemon(args):
+    """Serve capture and build jobs from a pool of warm browsers."""
+    from dotenv import load_dotenv
+    from http.server import ThreadingHTTPServer
+    load_dotenv()
+    
+    token = os.getenv(DAEMON_TOKEN_ENV_VAR)
+    if not token:
+        token = secrets.token_urlsafe(24)
+        print(f"🔑 No {DAEMON_TOKEN_ENV_VAR} in .env; token for this session: {token}")
+    
+    pool_size = args.pool_size
+    state = create_daemon_state(pool_size, token)
+    
+    workers = [
+        threading.Thread(target=daemon_worker, args=(state, worker_id, args.base_url), daemon=True)
+        for worker_id in range(pool_size)
+    ]
+    for worker in workers:
+        worker.start()
+    
+    server = ThreadingHTTPServer((DAEMON['host'], args.port), make_request_handler(state))
+    print(f"🛰️  Daemon listening on http://{DAEMON['host']}:{args.port} with {pool_size} browser(s)")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Shutting down daemon...")
+    finally:
+        server.server_close()
+        for _ in workers:
+            state['queue'].put((float('-inf'), next(state['sequence']), None))
+        for worker in workers:
+            worker.join()
+    
+    return True
+
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+def timed(function, wait_times, key):
+    """Wrap a function so its calls and wall time are added to wait_times[key]."""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            totals = wait_times.setdefault(key, [0, 0.0])
+            totals[0] += 1
+            totals[1] += time.perf_counter() - start
+    
+    return wrapper
+
+
+def timed_webdriver_execute(execute, wait_times):
+    """Wrap WebDriver.execute so every chromedriver round trip is timed per command."""
+    def wrapper(self, driver_command, params=None):
+        return timed(execute, wait_times, f"webdriver {driver_command}")(self, driver_command, params)
+    
+    return wrapper
+
+
+def sample_stacks(thread_id, stacks, stop_event):
+    """Sample a thread's Python stack until stopped, counting collapsed stacks."""
+    while not stop_event.wait(PROFILE['sample_interval']):
+        frame = sys._current_frames().get(thread_id)
+        frames = []
+        
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        
+        if frames:
+            stack = ';'.join(reversed(frames))
+            stacks[stack] = stacks.get(stack, 0) + 1
+
+
+def write_wait_report(report_path, wall_time, wait_times):
+    """Write and print where the wall time went: sleeps, WebDriver calls and the rest."""
+    sleep_time = sum(seconds for key, (_, seconds) in wait_times.items() if key == 'time.sleep')
+    webdriver_time = sum(seconds for key, (_, seconds) in wait_times.items() if key.startswith('webdriver'))
+    
+    lines = [
+        f"Wall time:          {wall_time:10.2f} s",
+        f"time.sleep:         {sleep_time:10.2f} s ({sleep_time / wall_time:.0%})",
+        f"WebDriver calls:    {webdriver_time:10.2f} s ({webdriver_time / wall_time:.0%})",
+        f"CPU, disk and rest: {wall_time - sleep_time - webdriver_time:10.2f} s",
+        "",
+        f"{'calls':>8} {'seconds':>10}  wait"
+    ]
+    for key, (calls, seconds) in sorted(wait_times.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{calls:>8} {seconds:>10.2f}  {key}")
+    
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    
+    print("\n".join(lines[:4]))
+
+
+def write_allocation_report(report_path, first_snapshot, last_snapshot, peak):
+    """Write the top allocations at the end of the run and their growth since the start."""
+    top = PROFILE['top_allocations']
+    lines = [f"Peak traced memory: {peak / (1 << 20):.1f} MiB", "", "Top allocations at end of run:"]
+    lines.extend(str(stat) for stat in last_snapshot.statistics('lineno')[:top])
+    lines.extend(["", "Top growth since start of run:"])
+    lines.extend(str(stat) for stat in last_snapshot.compare_to(first_snapshot, 'lineno')[:top])
+    
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def run_profiled(args):
+    """Run a subcommand under cProfile, tracemalloc and wait-time accounting.
+
+    Writes <command>_<time>.pstats, .allocations.txt, .waits.txt and a
+    flame-graph-compatible .collapsed.txt to the profiles directory.
+    """
+    import cProfile
+    import tracemalloc
+    
+    os.makedirs(PROFILE['dir'], exist_ok=True)
+    report_prefix = os.path.join(PROFILE['dir'], f"{args.command}_{time.strftime('%Y%m%d-%H%M%S')}")
+    
+    wait_times = {}
+    original_sleep = time.sleep
+    time.sleep = timed(original_sleep, wait_times, 'time.sleep')
+    
+    webdriver_class = None
+    if args.command == 'capture':
+        from selenium.webdriver.remote.webdriver import WebDriver as webdriver_class
+        original_execute = webdriver_class.execute
+        webdriver_class.execute = timed_webdriver_execute(original_execute, wait_times)
+    
+    stacks = {}
+    stop_sampling = threading.Event()
+    sampler = threading.Thread(
+        target=sample_stacks, args=(threading.get_ident(), stacks, stop_sampling), daemon=True
+    )
+    
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    first_snapshot = tracemalloc.take_snapshot()
+    start_time = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    
+    try:
+        return args.handler(args)
+    finally:
+        profiler.disable()
+        wall_time = time.perf_counter() - start_time
+        stop_sampling.set()
+        sampler.join()
+        last_snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        time.sleep = original_sleep
+        if webdriver_class is not None:
+            webdriver_class.execute = original_execute
+        
+        print(f"\n📊 Profile written to {report_prefix}.*")
+        profiler.dump_stats(f"{report_prefix}.pstats")
+        write_allocation_report(f"{report_prefix}.allocations.txt", first_snapshot, last_snapshot, peak)
+        write_wait_report(f"{report_prefix}.waits.txt", wall_time, wait_times)
+        
+        with open(f"{report_prefix}.collapsed.txt", 'w', encoding='utf-8') as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
 # ============================================================================
 # MAIN WORKFLOW
 # ============================================================================
 
-def main():
-    """Main application workflow."""
+def run_capture(args):
+    """Capture workflow: log in, pick a book and save its pages."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     print("🎨 iPlus Interactif Backup Utility (Functional Edition)")
     print("=" * 50)
     
+    if args.output in ('pdf', 'fast-pdf') and not pdf_output_allowed():
+        return False
+    
     driver = None
     
     try:
@@ -846,24 +2751,46 @@ def main():
             print("❌ Authentication failed. Please check credentials.")
             return False
         
-        # Step 3: Book Discovery and Selection
-        books = discover_books(driver)
+        # Step 3: Book Discovery (from the catalog when fresh) and Selection
+        catalog = load_catalog()
+        
+        if args.refresh or not catalog_is_fresh(catalog):
+            books = discover_books(driver)
+            if books:
+                update_catalog_books(catalog, books)
+                save_catalog(catalog)
+        else:
+            books = catalog_books(catalog)
+            print(f"Using cached catalog ({len(books)} books)")
+        
         if not books:
             print("❌ No books found. Please check website availability.")
             return False
         
-        selected_book = display_and_select_books(books)
-        if not selected_book:
-            print("👋 No book selected. Goodbye!")
-            return True
+        if args.book:
+            selected_book = find_book(books, args.book)
+            if not selected_book:
+                print(f"❌ Book '{args.book}' not found.")
+                return False
+        else:
+            selected_book = display_and_select_books(books)
+            if not selected_book:
+                print("👋 No book selected. Goodbye!")
+                return True
+            
+            # Step 4: User Confirmation
+            if not confirm_book_selection(selected_book):
+                print("👋 Operation cancelled. Goodbye!")
+                return True
         
-        # Step 4: User Confirmation
-        if not confirm_book_selection(selected_book):
-            print("👋 Operation cancelled. Goodbye!")
-            return True
+        if selected_book['element'] is None:
+            selected_book['element'] = resolve_book_element(driver, catalog, selected_book)
+            if selected_book['element'] is None:
+                print(f"❌ Could not find '{selected_book['title']}' in the library.")
+                return False
         
         # Step 5: Book and Volume Selection
-        volume_name = select_book_and_volume(driver, selected_book)
+        volume_name = select_book_and_volume(driver, selected_book, args.volume)
         if volume_name is None:
             print("❌ Book selection failed or cancelled.")
             return False
@@ -871,7 +2798,20 @@ def main():
             volume_name = None  # Single volume book
         
         # Step 5b: Page Disposition Selection
-        double_page_mode = double_page_mode_selection()
+        # Flags given on the command line skip their prompt
+        if args.double_page is not None:
+            double_page_mode = args.double_page
+        else:
+            double_page_mode = double_page_mode_selection()
+        
+        resume = resume_selection(args.resume)
+        
+        if args.stream_archive is not None:
+            archive_mode = args.stream_archive
+        elif args.output:
+            archive_mode = args.output == ARCHIVE_FORMAT
+        else:
+            archive_mode = archive_mode_selection()
 
         # Update book name with volume if applicable
         final_book_name = volume_name or selected_book['title']
@@ -887,7 +2827,19 @@ def main():
             return False
         
         # Step 7: Process Images
-        pages_processed, errors_encountered = process_book_pages(driver, double_page_mode)
+        known_volume = find_catalog_volume(catalog, selected_book['title'], volume_name)
+        expected_pages = known_volume['page_count'] if known_volume else None
+        
+        if archive_mode:
+            ensure_output_directory()
+            open_page_archive()
+        
+        try:
+            pages_processed, errors_encountered = process_book_pages(
+                driver, double_page_mode, resume, expected_pages
+            )
+        finally:
+            close_page_archive()
         
         if pages_processed == 0:
             print("❌ No pages were processed successfully.")
@@ -898,8 +2850,13 @@ def main():
         if errors_encountered > 0:
             print(f"⚠️  Warnings: {errors_encountered} pages had issues")
         
+        # Remember the page labels for ETAs and end-of-book checks next time
+        if errors_encountered == 0:
+            record_page_labels(catalog, selected_book['title'], volume_name, captured_page_labels())
+            save_catalog(catalog)
+        
         # Step 8: Output Processing
-        process_output(final_book_name, pages_processed)
+        process_output(final_book_name, pages_processed, OUTPUT_CHOICES.get(args.output))
         
         print("\n🎉 Backup operation completed successfully!")
         return True
@@ -919,6 +2876,126 @@ def main():
                 pass
 
 
+def run_build_pdf(args):
+    """Build a PDF from a saved page directory or archive, without a browser."""
+    source = args.source.rstrip('/\\')
+    book_name = args.name or os.path.splitext(os.path.basename(source))[0]
+    return create_pdf(book_name, source, args.fast_view)
+
+
+def run_archive(args):
+    """Pack a saved page directory into a CBZ archive."""
+    source = args.source.rstrip('/\\')
+    archive_path = args.output or f"{os.path.basename(source)}.{ARCHIVE_FORMAT}"
+    
+    page_count = write_archive(source, archive_path)
+    if not page_count:
+        print(f"No pages found in '{source}'")
+        return False
+    
+    print(f"Archive '{archive_path}' created ({page_count} pages)")
+    return True
+
+
+def run_verify(args):
+    """Check the pages of a saved directory: PNG structure and manifest hashes."""
+    page_count = len(collect_image_files(args.source))
+    if not page_count:
+        print(f"No pages found in '{args.source}'")
+        return False
+    
+    if not read_manifest(args.source):
+        print("No manifest found; checking PNG structure only")
+    
+    start_time = time.time()
+    bad_files = verify_pages(args.source)
+    duration = time.time() - start_time
+    report_memory_usage()
+    
+    for filename, problem in sorted(bad_files.items()):
+        print(f"❌ {filename}: {problem}")
+    
+    if bad_files:
+        print(f"{len(bad_files)} of {page_count} pages failed verification ({duration:.2f} seconds)")
+        return False
+    
+    print(f"✅ All {page_count} pages verified in {duration:.2f} seconds")
+    return True
+
+
+def build_parser():
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(description="iPlus Interactif Backup Utility")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    capture_parser = subparsers.add_parser('capture', help="capture a book from the website (default)")
+    capture_parser.add_argument('--book', help="book index or title, skips the book prompt")
+    capture_parser.add_argument('--volume', help="volume title, skips the volume prompts")
+    capture_parser.add_argument('--double-page', action=argparse.BooleanOptionalAction,
+                                help="capture in double-page mode (or not), skips the prompt")
+    capture_parser.add_argument('--resume', action=argparse.BooleanOptionalAction,
+                                help="resume from (or discard) pages left by a previous run, skips the prompt")
+    capture_parser.add_argument('--stream-archive', action=argparse.BooleanOptionalAction,
+                                help=f"stream pages into a {ARCHIVE_FORMAT.upper()} archive while capturing "
+                                     f"(default with --output {ARCHIVE_FORMAT})")
+    capture_parser.add_argument('--output', choices=list(OUTPUT_CHOICES), help="output to produce, skips the prompt")
+    capture_parser.add_argument('--refresh', action='store_true',
+                                help="discover books again instead of using the cached catalog")
+    capture_parser.add_argument('--memory-budget', type=int, metavar='MB',
+                                help="large-book mode: spill pages to memory-mapped files within this budget")
+    capture_parser.add_argument('--profile', action='store_true', help="write cProfile, memory and wait-time reports")
+    capture_parser.set_defaults(handler=run_capture)
+    
+    build_pdf_parser = subparsers.add_parser('build-pdf', help="build a PDF from saved pages")
+    build_pdf_parser.add_argument('source', help="page directory (e.g. save/<book>) or CBZ archive")
+    build_pdf_parser.add_argument('--name', help="output PDF name, without extension")
+    build_pdf_parser.add_argument('--fast-view', action='store_true',
+                                  help="linearized PDF with page labels and an outline")
+    build_pdf_parser.add_argument('--profile', action='store_true', help="write cProfile, memory and wait-time reports")
+    build_pdf_parser.set_defaults(handler=run_build_pdf)
+    
+    archive_parser = subparsers.add_parser('archive', help="pack saved pages into a CBZ archive")
+    archive_parser.add_argument('source', help="page directory (e.g. save/<book>)")
+    archive_parser.add_argument('--output', help="archive path")
+    archive_parser.set_defaults(handler=run_archive)
+    
+    verify_parser = subparsers.add_parser('verify', help="check saved pages for corruption")
+    verify_parser.add_argument('source', help="page directory (e.g. save/<book>)")
+    verify_parser.add_argument('--memory-budget', type=int, metavar='MB',
+                               help="large-book mode: limit parallel checks to this memory budget")
+    verify_parser.set_defaults(handler=run_verify)
+    
+    daemon_parser = subparsers.add_parser('daemon', help="serve capture and build jobs over a local HTTP API")
+    daemon_parser.add_argument('--port', type=int, default=DAEMON['port'], help="port to listen on (localhost only)")
+    daemon_parser.add_argument('--pool-size', type=int, default=DAEMON['pool_size'], help="number of warm browsers")
+    daemon_parser.add_argument('--base-url', default=BASE_URL, help="site to log in to, e.g. a local mock site")
+    daemon_parser.set_defaults(handler=run_daemon)
+    
+    return parser
+
+
+def main(argv=None):
+    """Dispatch to the selected subcommand; capture when none is given."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    
+    if not argv or (argv[0].startswith('-') and argv[0] not in ('-h', '--help')):
+        argv.insert(0, 'capture')
+    
+    args = build_parser().parse_args(argv)
+    
+    if getattr(args, 'memory_budget', None):
+        LARGE_BOOK['enabled'] = True
+        LARGE_BOOK['memory_budget_mb'] = args.memory_budget
+    
+    if getattr(args, 'profile', False):
+        success = run_profiled(args)
+    else:
+        success = args.handler(args)
+    
+    # A run that went over its --memory-budget fails even if its output was written
+    return success and not memory_budget_exceeded()
+
+
 if __name__ == "__main__":
     try:
         success = main()
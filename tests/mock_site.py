@@ -0,0 +1,258 @@
+"""In-memory mock of the i+ Interactif site, driven through a WebDriver-like API.
+
+MockBrowser answers the XPath selectors from main.SELECTORS for the login
+page, the library, a book page and the page viewer, so the capture code runs
+unchanged without Chrome. A MockSite can crash the browser after a given
+number of page captures to exercise the daemon's re-queue path.
+"""
+
+import base64
+import re
+import struct
+import threading
+import zlib
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+import main
+
+ENTER_KEY = '\ue007'
+
+
+def make_png(text):
+    """Build a small valid PNG whose pixels depend on text."""
+    def chunk(chunk_type, data):
+        crc = zlib.crc32(data, zlib.crc32(chunk_type))
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', crc)
+
+    width, height = 16, 8
+    seed = zlib.crc32(text.encode('utf-8'))
+    rows = b''.join(b'\x00' + bytes((seed + x + y) % 256 for x in range(width * 3)) for y in range(height))
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (main.PNG_SIGNATURE + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+
+class MockSite:
+    """Books served by the mock site, and the failures it should simulate."""
+
+    def __init__(self, books, crash_after_captures=None):
+        self.books = books  # Title -> list of page labels
+        self.crash_after_captures = crash_after_captures
+        self.captures = 0
+        self.books_opened = []
+        self.browsers = []
+        self.lock = threading.Lock()
+
+    def page_image(self, title, label):
+        return make_png(f"{title}/{label}")
+
+    def create_driver(self, headless=False, detach=True):
+        """Stand-in for main.create_driver."""
+        browser = MockBrowser(self)
+        with self.lock:
+            self.browsers.append(browser)
+        return browser
+
+    def record_capture(self):
+        """Count a capture; returns True when the browser should crash now."""
+        with self.lock:
+            self.captures += 1
+            if self.crash_after_captures is not None and self.captures > self.crash_after_captures:
+                self.crash_after_captures = None  # Crash once
+                return True
+        return False
+
+
+class MockElement:
+    """A page element with just the behaviour the capture code uses."""
+
+    def __init__(self, browser, text='', attributes=None, on_click=None, children=None):
+        self.browser = browser
+        self.text = text
+        self.attributes = attributes or {}
+        self.on_click = on_click
+        self.children = children or {}
+
+    def click(self):
+        self.browser.check_alive()
+        if self.on_click:
+            self.on_click()
+
+    def clear(self):
+        self.attributes['value'] = ''
+
+    def send_keys(self, keys):
+        if keys == ENTER_KEY:
+            self.browser.go_to_label(self.attributes.get('value', ''))
+        else:
+            self.attributes['value'] = self.attributes.get('value', '') + (keys or '')
+
+    def get_attribute(self, name):
+        self.browser.check_alive()
+        return self.attributes.get(name)
+
+    def get_dom_attribute(self, name):
+        return self.get_attribute(name)
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def find_element(self, by, selector):
+        if selector not in self.children:
+            raise NoSuchElementException(selector)
+        return self.children[selector]
+
+
+class MockSwitchTo:
+    def __init__(self, browser):
+        self.browser = browser
+
+    def window(self, handle):
+        self.browser.check_alive()
+        if handle not in self.browser.windows:
+            raise WebDriverException(f"no such window: {handle}")
+        self.browser.current = handle
+
+
+class MockBrowser:
+    """WebDriver stand-in browsing a MockSite."""
+
+    def __init__(self, site):
+        self.site = site
+        self.crashed = False
+        self.windows = {}  # Handle -> {'page': ..., page state}
+        self.handle_numbers = iter(range(1000000))
+        self.current = self.open_window({'page': 'blank'})
+        self.switch_to = MockSwitchTo(self)
+
+    def check_alive(self):
+        if self.crashed:
+            raise WebDriverException("chrome not reachable")
+
+    def open_window(self, state):
+        handle = f"window-{next(self.handle_numbers)}"
+        self.windows[handle] = state
+        return handle
+
+    @property
+    def window(self):
+        self.check_alive()
+        return self.windows[self.current]
+
+    @property
+    def window_handles(self):
+        self.check_alive()
+        return list(self.windows)
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def maximize_window(self):
+        pass
+
+    def get(self, url):
+        self.window.clear()
+        self.window.update({'page': 'login', 'url': url})
+
+    def close(self):
+        self.check_alive()
+        del self.windows[self.current]
+
+    def quit(self):
+        self.windows.clear()
+
+    # Navigation triggered by clicks
+
+    def log_in(self):
+        self.window['page'] = 'library'
+
+    def open_book_page(self, title):
+        with self.site.lock:
+            self.site.books_opened.append(title)
+        self.open_window({'page': 'book', 'title': title})
+
+    def open_viewer(self):
+        self.window.update({'page': 'viewer', 'index': 0})
+
+    def go_to_label(self, label):
+        labels = self.site.books[self.window['title']]
+        if label in labels:
+            self.window['index'] = labels.index(label)
+
+    def next_page(self):
+        labels = self.site.books[self.window['title']]
+        self.window['index'] = min(self.window['index'] + 1, len(labels) - 1)
+
+    # Element lookup
+
+    def find_element(self, by, selector):
+        elements = self.find_elements(by, selector)
+        if not elements:
+            raise NoSuchElementException(selector)
+        return elements[0]
+
+    def find_elements(self, by, selector):
+        window = self.window
+        page = window['page']
+        selectors = main.SELECTORS
+
+        if page == 'login':
+            if selector in (selectors['login_email'], selectors['login_password']):
+                return [MockElement(self)]
+            if selector == selectors['login_button']:
+                return [MockElement(self, on_click=self.log_in)]
+
+        elif page == 'library' and selector == selectors['book_containers']:
+            return [
+                MockElement(self, on_click=lambda title=title: self.open_book_page(title),
+                            children={selectors['book_title']: MockElement(self, text=title)})
+                for title in self.site.books
+            ]
+
+        elif page == 'book' and selector == selectors['open_book']:
+            return [MockElement(self, on_click=self.open_viewer)]
+
+        elif page == 'viewer':
+            labels = self.site.books[window['title']]
+            label = labels[window['index']]
+
+            if selector == selectors['page_input']:
+                return [MockElement(self, attributes={'value': label})]
+            if selector == selectors['main_image']:
+                return [MockElement(self, attributes={'src': f"mock://{window['title']}/{label}.png"})]
+            if selector == selectors['tool_bar']:
+                return [MockElement(self, attributes={'class': "toolsPageItems currentOnePage\n"})]
+            if selector == selectors['next_arrow']:
+                last = window['index'] == len(labels) - 1
+                return [MockElement(self, attributes={'class': 'arrowRight' + (' disabled' if last else '')},
+                                    on_click=self.next_page)]
+
+        elif page == 'image' and selector == "//img":
+            return [MockElement(self)]
+
+        return []
+
+    def execute_script(self, script, *args):
+        self.check_alive()
+
+        if script.startswith("arguments[0].click()"):
+            args[0].click()
+            return None
+
+        opened = re.match(r'window\.open\("mock://(.+)/(.+)\.png"', script)
+        if opened:
+            self.open_window({'page': 'image', 'title': opened.group(1), 'label': opened.group(2)})
+            return None
+
+        if 'toDataURL' in script and self.window['page'] == 'image':
+            if self.site.record_capture():
+                self.crashed = True
+                raise WebDriverException("chrome not reachable")
+            image = self.site.page_image(self.window['title'], self.window['label'])
+            return base64.b64encode(image).decode('ascii')
+
+        return None
@@ -0,0 +1,38 @@
+"""Scripted capture against the mock site: flags replace every prompt."""
+
+import builtins
+import zipfile
+
+import main
+from mock_site import MockSite
+
+
+def test_capture_flags_skip_every_prompt(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for key in main.TIMEOUTS:
+        monkeypatch.setitem(main.TIMEOUTS, key, 0)
+
+    site = MockSite({'Alpha': ['C1', '1'], 'Beta': ['C1', 'i', '1', '2', 'C4']})
+    monkeypatch.setattr(main, 'create_driver', site.create_driver)
+
+    def prompt(*args):
+        raise AssertionError(f"Unexpected prompt: {args}")
+    monkeypatch.setattr(builtins, 'input', prompt)
+
+    assert main.main(['capture', '--book', 'Beta', '--no-double-page', '--no-resume',
+                      '--output', main.ARCHIVE_FORMAT])
+
+    with zipfile.ZipFile(f"Beta.{main.ARCHIVE_FORMAT}") as archive:
+        assert main.list_archive_pages(archive) == [
+            main.page_filename(label) for label in ('C1', 'i', '1', '2', 'C4')]
+    assert site.books_opened == ['Beta']
+
+
+def test_pdf_output_is_refused_with_a_memory_budget(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, 'LARGE_BOOK', dict(main.LARGE_BOOK))
+    site = MockSite({'Alpha': ['C1', '1']})
+    monkeypatch.setattr(main, 'create_driver', site.create_driver)
+
+    assert not main.main(['capture', '--book', 'Alpha', '--memory-budget', '4096', '--output', 'pdf'])
+    assert not site.browsers  # Refused before starting a browser
@@ -0,0 +1,166 @@
+"""Daemon mode against the mock site: job API, priority order and crash re-queue."""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import zipfile
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import main
+from mock_site import MockSite
+
+TOKEN = 'test-token'
+MOCK_URL = 'mock://iplus'
+
+
+@pytest.fixture
+def fast_timeouts(monkeypatch, tmp_path):
+    """Run in a scratch directory with the site delays and retry backoff cut down."""
+    monkeypatch.chdir(tmp_path)
+    for key in main.TIMEOUTS:
+        monkeypatch.setitem(main.TIMEOUTS, key, 0)
+    monkeypatch.setitem(main.RETRY, 'max_attempts', 1)
+    monkeypatch.setitem(main.RETRY, 'backoff_base', 1)
+
+
+def start_daemon(monkeypatch, site, pool_size=1, start_workers=True):
+    """Serve the job API on a free port; returns (state, base URL, start_workers, stop)."""
+    monkeypatch.setattr(main, 'create_driver', site.create_driver)
+
+    state = main.create_daemon_state(pool_size, TOKEN)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), main.make_request_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    workers = [
+        threading.Thread(target=main.daemon_worker, args=(state, worker_id, MOCK_URL), daemon=True)
+        for worker_id in range(pool_size)
+    ]
+
+    def start():
+        for worker in workers:
+            worker.start()
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+        started = [worker for worker in workers if worker.ident is not None]
+        for _ in started:
+            state['queue'].put((float('-inf'), next(state['sequence']), None))
+        for worker in started:
+            worker.join(timeout=30)
+
+    if start_workers:
+        start()
+
+    return state, f"http://127.0.0.1:{server.server_port}", start, stop
+
+
+def api(base_url, path, body=None, content_type='application/json', token=TOKEN):
+    """Call the job API; returns (status, decoded JSON)."""
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(base_url + path, data=data, method='POST' if data else 'GET')
+    if data:
+        request.add_header('Content-Type', content_type)
+    if token:
+        request.add_header('Authorization', f"Bearer {token}")
+
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def wait_for_jobs(base_url, job_ids, timeout=60):
+    """Poll the API until every job is done or failed."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        jobs = {job_id: api(base_url, f"/jobs/{job_id}")[1] for job_id in job_ids}
+        if all(job['state'] in ('done', 'failed') for job in jobs.values()):
+            return jobs
+        time.sleep(0.2)
+    raise AssertionError(f"Jobs did not finish: {jobs}")
+
+
+def archive_pages(path):
+    with zipfile.ZipFile(path) as archive:
+        return sorted({name for name in archive.namelist() if name.endswith(f".{main.IMAGE_FORMAT}")})
+
+
+def test_api_rejects_unauthenticated_and_cross_site_requests(monkeypatch, fast_timeouts):
+    state, base_url, _, stop = start_daemon(monkeypatch, MockSite({}), start_workers=False)
+    try:
+        job = {'type': 'build', 'source': 'save/book'}
+
+        assert api(base_url, "/jobs", job, token=None)[0] == 401
+        assert api(base_url, "/jobs", token='wrong')[0] == 401
+        assert api(base_url, "/jobs", job, content_type='text/plain')[0] == 415
+        assert api(base_url, "/jobs", dict(job, source='../save/book'))[0] == 400
+        assert api(base_url, "/jobs", dict(job, source='save/../..'))[0] == 400
+        assert api(base_url, "/jobs", {'type': 'capture', 'book': ''})[0] == 400
+        assert api(base_url, "/jobs", {'type': 'capture', 'book': 0})[0] == 202
+
+        status, created = api(base_url, "/jobs", job)
+        assert status == 202 and created['state'] == 'queued'
+        assert api(base_url, f"/jobs/{created['id']}")[1]['id'] == created['id']
+        assert api(base_url, "/metrics")[1]['queue_depth'] == 2
+    finally:
+        stop()
+
+
+def test_jobs_run_in_priority_order(monkeypatch, fast_timeouts):
+    site = MockSite({
+        'Alpha': ['C1', '1', '2'],
+        'Beta': ['C1', '1'],
+        'Gamma': ['C1', '1', 'C4']
+    })
+    state, base_url, start_workers, stop = start_daemon(monkeypatch, site, start_workers=False)
+    try:
+        job_ids = [
+            api(base_url, "/jobs", {'type': 'capture', 'book': title, 'output': main.ARCHIVE_FORMAT,
+                                    'priority': priority})[1]['id']
+            for title, priority in (('Alpha', 5), ('Beta', 0), ('Gamma', 1))
+        ]
+        start_workers()
+        jobs = wait_for_jobs(base_url, job_ids)
+    finally:
+        stop()
+
+    assert [job['state'] for job in jobs.values()] == ['done'] * 3
+    assert site.books_opened == ['Beta', 'Gamma', 'Alpha']
+    assert archive_pages(f"Gamma.{main.ARCHIVE_FORMAT}") == sorted(
+        main.page_filename(label) for label in ('C1', '1', 'C4'))
+
+    metrics = main.daemon_metrics(state)
+    assert metrics['jobs'] == {'done': 3}
+    assert metrics['drivers_started'] == 1 and metrics['pages_captured'] == 8
+
+
+def test_capture_is_requeued_and_resumed_after_a_browser_crash(monkeypatch, fast_timeouts):
+    labels = ['C1', 'C2', '1', '2', '3', 'C4']
+    site = MockSite({'Alpha': labels}, crash_after_captures=3)
+    state, base_url, _, stop = start_daemon(monkeypatch, site)
+    try:
+        job_id = api(base_url, "/jobs", {'type': 'capture', 'book': 'Alpha',
+                                         'output': main.ARCHIVE_FORMAT})[1]['id']
+        job = wait_for_jobs(base_url, [job_id])[job_id]
+    finally:
+        stop()
+
+    assert job['state'] == 'done', job['error']
+    assert job['attempts'] == 2
+    assert job['result']['pages'] == len(labels)
+
+    # Pages saved before the crash were kept, so only the rest were captured again
+    assert site.captures == len(labels) + 1
+    assert archive_pages(f"Alpha.{main.ARCHIVE_FORMAT}") == sorted(main.page_filename(label) for label in labels)
+
+    metrics = main.daemon_metrics(state)
+    assert metrics['driver_restarts'] == 1
+    assert metrics['jobs_requeued'] == 1
+    assert metrics['drivers_started'] == 2
+    assert len(site.browsers) == 2 and site.browsers[0].crashed
@@ -0,0 +1,107 @@
+"""Large-book mode: a synthetic 1,000-page book stays within the memory budget."""
+
+import base64
+import io
+import os
+import struct
+import subprocess
+import sys
+import zipfile
+import zlib
+
+import main
+
+PAGE_COUNT = 1000
+PAGE_SIZE = 2 << 20
+LARGE_PAGE_COUNT = 20
+LARGE_PAGE_SIZE = 8 << 20  # Big enough that mapping every page at once breaks the budget
+MEMORY_BUDGET_MB = 64
+
+# Runs in a fresh interpreter so ru_maxrss only covers the page workload
+WORKLOAD = """
+import sys
+sys.path.insert(0, {root!r})
+import main
+
+main.LARGE_BOOK.update(enabled={enabled}, memory_budget_mb={budget})
+directory = sys.argv[1]
+with open(sys.argv[2]) as f:
+    base64_data = f.read()
+
+main.open_page_archive(directory)
+for number in range(1, {pages} + 1):
+    main.save_base64_image(base64_data, str(number), directory)
+main.close_page_archive(directory)
+
+bad_files = main.verify_pages(directory)
+print(len(bad_files), main.peak_rss_mb())
+"""
+
+
+def synthetic_page(size):
+    """Build a valid PNG of about size bytes: random pixels, unfiltered rows, stored IDAT."""
+    def chunk(chunk_type, data):
+        crc = zlib.crc32(data, zlib.crc32(chunk_type))
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', crc)
+
+    width = 1024
+    row_size = width * 3 + 1
+    height = size // row_size
+    rows = bytearray(os.urandom(height * row_size))
+    rows[::row_size] = bytes(height)  # Filter type 0 at the start of every row
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (main.PNG_SIGNATURE + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(rows, 0)) + chunk(b'IEND', b''))
+
+
+def run_workload(tmp_path, page_size, pages, large_book):
+    """Save and verify a synthetic book in a fresh interpreter; returns (directory, bad files, peak MiB)."""
+    directory = tmp_path / "imgs"
+    directory.mkdir(parents=True)
+    payload_path = tmp_path / "page.b64"
+    payload_path.write_text(base64.b64encode(synthetic_page(page_size)).decode('ascii'))
+
+    script = WORKLOAD.format(root=os.path.dirname(os.path.abspath(main.__file__)),
+                             enabled=large_book, budget=MEMORY_BUDGET_MB, pages=pages)
+    result = subprocess.run([sys.executable, "-c", script, str(directory), str(payload_path)],
+                            capture_output=True, text=True, check=True)
+    bad_files, peak = result.stdout.split()[-2:]
+    return directory, int(bad_files), float(peak)
+
+
+def test_synthetic_page_decodes():
+    from PIL import Image
+
+    with Image.open(io.BytesIO(synthetic_page(1 << 16))) as image:
+        image.load()
+        assert image.size == (1024, (1 << 16) // (1024 * 3 + 1))
+
+
+def test_synthetic_book_stays_within_memory_budget(tmp_path):
+    directory, bad_files, peak = run_workload(tmp_path, PAGE_SIZE, PAGE_COUNT, large_book=True)
+
+    assert len(main.collect_image_files(str(directory))) == PAGE_COUNT
+    with zipfile.ZipFile(directory / main.STREAM_ARCHIVE_NAME) as archive:
+        assert len(main.list_archive_pages(archive)) == PAGE_COUNT
+    assert bad_files == 0
+    assert peak < MEMORY_BUDGET_MB
+
+
+def test_large_pages_only_fit_the_budget_in_large_book_mode(tmp_path):
+    _, bad_files, large_book_peak = run_workload(tmp_path / "large", LARGE_PAGE_SIZE, LARGE_PAGE_COUNT, True)
+    assert bad_files == 0
+    assert large_book_peak < MEMORY_BUDGET_MB
+
+    _, bad_files, normal_peak = run_workload(tmp_path / "normal", LARGE_PAGE_SIZE, LARGE_PAGE_COUNT, False)
+    assert bad_files == 0
+    assert normal_peak > MEMORY_BUDGET_MB
+
+
+def test_run_over_budget_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'LARGE_BOOK', dict(main.LARGE_BOOK))
+    directory = str(tmp_path)
+    main.save_base64_image(base64.b64encode(synthetic_page(1 << 16)).decode('ascii'), '1', directory)
+
+    assert main.main(['verify', directory, '--memory-budget', '100000'])
+    assert not main.main(['verify', directory, '--memory-budget', '1'])